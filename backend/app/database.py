@@ -1,6 +1,8 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 import os
 from dotenv import load_dotenv
 
@@ -15,9 +17,17 @@ if DATABASE_URL.startswith("postgres://"):
 
 # Create engine with appropriate settings for PostgreSQL or SQLite
 if "postgresql" in DATABASE_URL:
-    engine = create_engine(DATABASE_URL)
+    # Point DATABASE_URL at Neon's -pooler host (PgBouncer, transaction mode) so
+    # API workers share server connections; pre-ping drops ones the pooler closed
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_size=5, max_overflow=10)
 else:
     engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+def insert_for_dialect(model):
+    """Return an INSERT supporting ON CONFLICT clauses for the configured database"""
+    if engine.dialect.name == "postgresql":
+        return pg_insert(model)
+    return sqlite_insert(model)
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse
+from fastapi.responses import FileResponse, RedirectResponse, ORJSONResponse
 import os
 import requests
 import urllib.parse
@@ -9,7 +9,7 @@ from dotenv import load_dotenv
 from datetime import datetime
 
 from .database import engine, SessionLocal
-from .models import Base, Prospectus, Property, Match
+from .models import init_db, Prospectus, Property, Match
 from .parsers.prospectus_parser import ProspectusParser
 from .parsers.gsa_scraper import GSAScraper
 from .matchers.property_matcher import PropertyMatcher
@@ -18,9 +18,9 @@ from .notion_sync import NotionSync
 load_dotenv()
 
 # Create tables
-Base.metadata.create_all(bind=engine)
+init_db(engine)
 
-app = FastAPI(title="LeaseHawk MVP")
+app = FastAPI(title="LeaseHawk MVP", default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -67,6 +67,10 @@ def get_notion():
         notion = NotionSync()
     return notion
 
+def row_to_dict(row):
+    """Flatten a SQLAlchemy row into its column values (ready for orjson)"""
+    return {c.name: getattr(row, c.name) for c in row.__table__.columns}
+
 @app.get("/")
 def read_root():
     # Serve the frontend index.html at root
@@ -124,12 +128,15 @@ async def parse_prospectus(file: UploadFile = File(...)):
         "data": data
     }
 
-@app.get("/prospectuses/")
+@app.get("/prospectuses/", response_model=None)
 def get_prospectuses():
     """Get all parsed prospectuses"""
     db = SessionLocal()
-    prospectuses = db.query(Prospectus).all()
-    return prospectuses
+    try:
+        prospectuses = db.query(Prospectus).all()
+        return ORJSONResponse([row_to_dict(p) for p in prospectuses])
+    finally:
+        db.close()
 
 @app.post("/match-properties/{prospectus_id}")
 def match_properties(prospectus_id: int):
@@ -172,7 +179,7 @@ def match_properties(prospectus_id: int):
         "top_matches": matches[:5]
     }
 
-@app.get("/opportunities/")
+@app.get("/opportunities/", response_model=None)
 def get_opportunities():
     """Get upcoming lease opportunities with match counts"""
     db = SessionLocal()
@@ -219,18 +226,18 @@ def get_opportunities():
         # Sort by urgency (soonest expiration first)
         opportunities.sort(key=lambda x: x["days_until_expiration"] if x["days_until_expiration"] is not None else 999999)
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "count": len(opportunities),
             "opportunities": opportunities
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         db.close()
 
-@app.get("/api/gsa-pipeline/")
+@app.get("/api/gsa-pipeline/", response_model=None)
 def get_gsa_pipeline():
     """Get GSA prospectuses pipeline data optimized for dashboard display"""
     db = SessionLocal()
@@ -285,7 +292,7 @@ def get_gsa_pipeline():
             -x["annual_value"] if x["annual_value"] else 0
         ))
         
-        return {
+        return ORJSONResponse({
             "status": "success",
             "pipeline_summary": {
                 "total_opportunities": len(pipeline_data),
@@ -295,7 +302,7 @@ def get_gsa_pipeline():
                 "low_urgency": len([p for p in pipeline_data if p["urgency"] == "Low"])
             },
             "opportunities": pipeline_data
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
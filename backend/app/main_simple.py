@@ -7,12 +7,12 @@ from dotenv import load_dotenv
 from datetime import datetime
 
 from .database import engine, SessionLocal
-from .models import Base, Prospectus, Property, Match
+from .models import init_db, Prospectus, Property, Match
 
 load_dotenv()
 
 # Create tables
-Base.metadata.create_all(bind=engine)
+init_db(engine)
 
 app = FastAPI(title="LeaseHawk MVP - Database Integration")
 
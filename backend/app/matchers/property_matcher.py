@@ -1,7 +1,53 @@
 from typing import List, Dict
 import math
+import numpy as np
 from geopy.distance import geodesic
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional - matching falls back to the pure-Python scorer
+    njit = None
+    prange = range
+
+LOCATION_PLACEHOLDER_SCORE = 75.0
+
+def _score_kernel(target_sqft, target_parking, target_rate, sqft, parking, rent,
+                  w_size, w_location, w_parking, w_price):
+    """Score every candidate property against one prospectus.
+
+    Mirrors calculate_match_score on flat float64 columns (missing values are NaN).
+    Returns an (n, 4) array of total, size, parking and price scores.
+    """
+    n = sqft.shape[0]
+    out = np.empty((n, 4))
+    for i in prange(n):
+        size = 100.0 - abs(sqft[i] - target_sqft) / target_sqft * 100.0
+        if not size > 0.0:
+            size = 0.0
+
+        if target_parking > 0.0 and parking[i] > 0.0:
+            park = min(100.0, parking[i] / target_parking * 100.0)
+        else:
+            park = 50.0
+
+        if rent[i] > 0.0 and target_rate > 0.0:
+            if rent[i] <= target_rate:
+                price = 100.0
+            else:
+                price = max(0.0, 100.0 - (rent[i] - target_rate) / target_rate * 100.0)
+        else:
+            price = 50.0
+
+        out[i, 0] = (size * w_size + LOCATION_PLACEHOLDER_SCORE * w_location
+                     + park * w_parking + price * w_price)
+        out[i, 1] = size
+        out[i, 2] = park
+        out[i, 3] = price
+    return out
+
+if njit is not None:
+    _score_kernel = njit(cache=True, parallel=True)(_score_kernel)
+
 class PropertyMatcher:
     def __init__(self):
         self.weights = {
@@ -51,8 +97,74 @@ class PropertyMatcher:
             'location_score': scores['location']
         }
     
-    def find_matches(self, prospectus: Dict, properties: List[Dict], min_score: float = 60) -> List[Dict]:
-        """Find all properties that match prospectus requirements"""
+    def build_columns(self, properties: List[Dict]) -> Dict[str, np.ndarray]:
+        """Extract the scoring inputs of a property list into float64 columns (None becomes NaN)"""
+        return {
+            'available_sqft': np.array([p.get('available_sqft') for p in properties], dtype=np.float64),
+            'parking_spaces': np.array([p.get('parking_spaces') for p in properties], dtype=np.float64),
+            'asking_rent_per_sqft': np.array([p.get('asking_rent_per_sqft') for p in properties], dtype=np.float64)
+        }
+    
+    def index_by_state(self, properties: List[Dict]):
+        """Map each state to the indices of its candidate properties.
+        
+        Properties with no recorded state are candidates everywhere. Returns the
+        state index and the stateless indices (the candidates for unknown states).
+        """
+        stateless = [i for i, p in enumerate(properties) if not p.get('state')]
+        by_state = {}
+        for i, p in enumerate(properties):
+            if p.get('state'):
+                by_state.setdefault(p['state'].upper(), []).append(i)
+        index = {state: np.array(sorted(idx + stateless), dtype=np.int64)
+                 for state, idx in by_state.items()}
+        return index, np.array(stateless, dtype=np.int64)
+    
+    def find_matches(self, prospectus: Dict, properties: List[Dict], min_score: float = 60,
+                     columns: Dict[str, np.ndarray] = None, candidate_idx: np.ndarray = None) -> List[Dict]:
+        """Find all properties that match prospectus requirements
+        
+        columns: precomputed build_columns(properties), reused across prospectuses
+        candidate_idx: restrict scoring to these property indices (see index_by_state)
+        """
+        if njit is None or not properties or not prospectus.get('estimated_nusf'):
+            if candidate_idx is not None:
+                properties = [properties[i] for i in candidate_idx]
+            return self._find_matches_python(prospectus, properties, min_score)
+        
+        if columns is None:
+            columns = self.build_columns(properties)
+        if candidate_idx is None:
+            candidate_idx = np.arange(len(properties))
+        
+        scored = _score_kernel(
+            float(prospectus['estimated_nusf']),
+            float(prospectus.get('parking_spaces') or 0),
+            float(prospectus.get('rental_rate_per_nusf') or 0),
+            columns['available_sqft'][candidate_idx],
+            columns['parking_spaces'][candidate_idx],
+            columns['asking_rent_per_sqft'][candidate_idx],
+            self.weights['size'], self.weights['location'],
+            self.weights['parking'], self.weights['price']
+        )
+        
+        # Keep qualifying rows, best first (stable, like list.sort)
+        keep = np.nonzero(scored[:, 0] >= min_score)[0]
+        keep = keep[np.argsort(-scored[keep, 0], kind='stable')]
+        
+        return [{
+            'property': properties[candidate_idx[i]],
+            'scores': {
+                'total_score': float(scored[i, 0]),
+                'size_score': float(scored[i, 1]),
+                'parking_score': float(scored[i, 2]),
+                'price_score': float(scored[i, 3]),
+                'location_score': LOCATION_PLACEHOLDER_SCORE
+            }
+        } for i in keep]
+    
+    def _find_matches_python(self, prospectus: Dict, properties: List[Dict], min_score: float) -> List[Dict]:
+        """Reference implementation scoring one property at a time"""
         matches = []
         
         for property in properties:
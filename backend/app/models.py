@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, JSON, Boolean, Index, text, inspect
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 
 Base = declarative_base()
 
+# Binary jsonb on Postgres; plain JSON text elsewhere (SQLite)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class Prospectus(Base):
     __tablename__ = "prospectuses"
     
@@ -30,7 +35,7 @@ class Prospectus(Base):
     max_lease_term_years = Column(Integer)
     
     # Location Requirements
-    delineated_area = Column(JSON)  # Store as JSON with north, south, east, west
+    delineated_area = Column(JSONType)  # Store as JSON with north, south, east, west
     parking_spaces = Column(Integer)
     
     # Additional Requirements
@@ -41,10 +46,19 @@ class Prospectus(Base):
     # Metadata
     pdf_url = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)  # Keys the deal caches
     status = Column(String, default="active")  # active, awarded, cancelled
     notion_id = Column(String)  # Store Notion page ID for sync
     
+    # Partial indexes backing the daily brief's hot "active" filters
+    __table_args__ = (
+        Index('ix_prospectus_active_expiration', 'status', 'current_lease_expiration',
+              postgresql_where=text("status = 'active'"), sqlite_where=text("status = 'active'")),
+        Index('ix_prospectus_active_cost', 'status', 'estimated_annual_cost',
+              postgresql_where=text("status = 'active'"), sqlite_where=text("status = 'active'")),
+        Index('ix_prospectus_created_at', 'created_at'),
+    )
+    
 class Property(Base):
     __tablename__ = "properties"
     
@@ -76,6 +90,11 @@ class Property(Base):
     updated_at = Column(DateTime, default=datetime.utcnow)
     notion_id = Column(String)  # Store Notion page ID for sync
     
+    # Addresses identify a property everywhere it's deduplicated; unique so inserts can skip conflicts
+    __table_args__ = (
+        Index('ix_property_address', 'address', unique=True),
+    )
+    
 class Match(Base):
     __tablename__ = "matches"
     
@@ -92,7 +111,67 @@ class Match(Base):
     
     # Analysis
     notes = Column(Text)
-    compliance_gaps = Column(JSON)
+    compliance_gaps = Column(JSONType)
     
     created_at = Column(DateTime, default=datetime.utcnow)
-    status = Column(String, default="potential")  # potential, contacted, pursuing, won, lost
\ No newline at end of file
+    status = Column(String, default="potential")  # potential, contacted, pursuing, won, lost
+    
+    __table_args__ = (
+        Index('ix_match_prospectus_score', 'prospectus_id', 'total_score'),
+    )
+    
+class UrgentActionLog(Base):
+    __tablename__ = "urgent_action_log"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    prospectus_id = Column(Integer, index=True)
+    
+    action_type = Column(String)  # EXPIRING_SOON, NO_PROPERTIES, OUTREACH_NEEDED
+    priority = Column(String)  # CRITICAL, HIGH, MEDIUM
+    action = Column(Text)
+    deadline = Column(DateTime)
+    annual_value = Column(Float)
+    
+    brief_at = Column(DateTime, index=True)  # Timestamp of the daily brief that raised it
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+    
+    query_key = Column(String, primary_key=True)  # Normalized "location, state" geocoder query
+    latitude = Column(Float)
+    longitude = Column(Float)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+# Rows sharing an address with a lower id; they block the unique ix_property_address
+DUPLICATE_PROPERTY_IDS = """
+    SELECT id FROM properties
+    WHERE address IS NOT NULL
+      AND id NOT IN (SELECT MIN(id) FROM properties WHERE address IS NOT NULL GROUP BY address)
+"""
+
+def init_db(bind):
+    """Create missing tables, then any declared index that older tables lack
+    
+    There are no migrations: create_all skips tables that already exist, so indexes added
+    to a model later are created here with IF NOT EXISTS. Before the unique address index
+    is first built, duplicate properties are merged into the lowest id for that address.
+    """
+    Base.metadata.create_all(bind=bind)
+    
+    with bind.begin() as conn:
+        property_indexes = {ix['name'] for ix in inspect(conn).get_indexes(Property.__tablename__)}
+        if 'ix_property_address' not in property_indexes:
+            conn.execute(text(f"""
+                UPDATE matches SET property_id = (
+                    SELECT MIN(keep.id) FROM properties dup
+                    JOIN properties keep ON keep.address = dup.address
+                    WHERE dup.id = matches.property_id
+                )
+                WHERE property_id IN ({DUPLICATE_PROPERTY_IDS})
+            """))
+            conn.execute(text(f"DELETE FROM properties WHERE id IN ({DUPLICATE_PROPERTY_IDS})"))
+        
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
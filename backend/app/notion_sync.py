@@ -6,10 +6,15 @@ import os
 from typing import List, Dict, Any
 from datetime import datetime
 import requests
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def _json_body(payload: Dict[str, Any]) -> bytes:
+    """Encode a request body with orjson; the headers already declare application/json"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+
 class NotionSync:
     def __init__(self):
         self.notion_token = os.getenv("NOTION_TOKEN")
@@ -22,6 +27,8 @@ class NotionSync:
         else:
             self.headers = None
         self.base_url = "https://api.notion.com/v1"
+        # One pooled connection to the API for every call, including concurrent ones
+        self.http = requests.Session()
         
         # Database IDs - will be set from environment
         self.prospectus_db_id = os.getenv("NOTION_PROSPECTUS_DB")
@@ -34,7 +41,7 @@ class NotionSync:
             
         url = f"{self.base_url}/databases/{self.prospectus_db_id}/query"
         
-        response = requests.post(url, headers=self.headers)
+        response = self.http.post(url, headers=self.headers)
         if response.status_code != 200:
             raise Exception(f"Notion API error: {response.text}")
             
@@ -69,7 +76,7 @@ class NotionSync:
             
         url = f"{self.base_url}/databases/{self.property_db_id}/query"
         
-        response = requests.post(url, headers=self.headers)
+        response = self.http.post(url, headers=self.headers)
         if response.status_code != 200:
             raise Exception(f"Notion API error: {response.text}")
             
@@ -106,13 +113,13 @@ class NotionSync:
                 }
             }
         }
-        requests.patch(prospectus_url, headers=self.headers, json=prospectus_data)
+        self.http.patch(prospectus_url, headers=self.headers, data=_json_body(prospectus_data))
         
         # Update property with match scores
         property_url = f"{self.base_url}/pages/{property_notion_id}"
         
         # First get existing scores
-        existing_scores_response = requests.get(property_url, headers=self.headers)
+        existing_scores_response = self.http.get(property_url, headers=self.headers)
         if existing_scores_response.status_code == 200:
             existing_data = existing_scores_response.json()
             existing_scores = self._get_text(existing_data["properties"].get("Match Scores", {})) or ""
@@ -132,7 +139,7 @@ class NotionSync:
                     }
                 }
             }
-            requests.patch(property_url, headers=self.headers, json=property_data)
+            self.http.patch(property_url, headers=self.headers, data=_json_body(property_data))
     
     def add_property_from_search(self, property_data: Dict[str, Any]) -> str:
         """Add a new property found from web search to Notion"""
@@ -175,7 +182,7 @@ class NotionSync:
             }
         }
         
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self.http.post(url, headers=self.headers, data=_json_body(data))
         if response.status_code == 200:
             return response.json().get("id")
         else:
@@ -230,7 +237,7 @@ class NotionSync:
                     "date": {"start": lease_exp.isoformat()}
                 }
         
-        response = requests.post(url, headers=self.headers, json=data)
+        response = self.http.post(url, headers=self.headers, data=_json_body(data))
         if response.status_code == 200:
             return response.json().get("id")
         else:
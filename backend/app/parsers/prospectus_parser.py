@@ -1,11 +1,33 @@
 import PyPDF2
 import re
+import shutil
+import subprocess
 from datetime import datetime
 import google.generativeai as genai
 import json
 import os
 from typing import Dict, Any
 
+# Native text extractor, far faster than PyPDF2; optional
+PDFTOTEXT = shutil.which('pdftotext')
+
+# Leading characters of the prospectus text sent to the LLM
+LLM_TEXT_CHARS = 4000
+
+def extract_pdf_text(pdf_path: str) -> str:
+    """Extract raw text from PDF, using poppler's pdftotext when it is installed.
+    
+    Module-level so it can run in a worker process.
+    """
+    if PDFTOTEXT:
+        result = subprocess.run([PDFTOTEXT, pdf_path, '-'], capture_output=True)
+        if result.returncode == 0:
+            return result.stdout.decode('utf-8', errors='replace')
+    
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return "".join(page.extract_text() for page in pdf_reader.pages)
+
 class ProspectusParser:
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
@@ -21,12 +43,7 @@ class ProspectusParser:
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract raw text from PDF"""
-        text = ""
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+        return extract_pdf_text(pdf_path)
     
     def parse_with_llm(self, text: str) -> Dict[str, Any]:
         """Use Gemini to extract structured data from prospectus text"""
@@ -66,7 +83,7 @@ class ProspectusParser:
         Prospectus text:
         """
         
-        full_prompt = "You are a GSA prospectus data extraction expert. Extract data precisely as it appears in the document.\n\n" + prompt + "\n\nProspectus text:\n" + text[:4000]
+        full_prompt = "You are a GSA prospectus data extraction expert. Extract data precisely as it appears in the document.\n\n" + prompt + "\n\nProspectus text:\n" + text[:LLM_TEXT_CHARS]
         
         response = self.model.generate_content(full_prompt)
         
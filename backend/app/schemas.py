@@ -1,4 +1,9 @@
-"""Pydantic schemas for API request/response models."""
+"""Pydantic schemas for API request/response models.
+
+The hot listing endpoints in ``main.py`` are declared with ``response_model=None``
+and return pre-built dicts through ``ORJSONResponse``, so outgoing data is not
+re-validated against the response schemas below; they document the shape only.
+"""
 
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
@@ -6,30 +6,21 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.database import SessionLocal, engine
-from app.models import Base, Prospectus
+from app.database import SessionLocal, engine, insert_for_dialect
+from app.models import init_db, Prospectus
 from datetime import datetime
 
 def load_va_opportunities():
     """Load the two high-value VA opportunities"""
     
     # Create tables
-    Base.metadata.create_all(bind=engine)
+    init_db(engine)
     
     db = SessionLocal()
     
     try:
-        # Check if data already exists
-        existing = db.query(Prospectus).filter(
-            Prospectus.prospectus_number.in_(["POH-09-VA25", "PUT-24-VA25"])
-        ).count()
-        
-        if existing > 0:
-            print(f"✅ Production data already exists ({existing} prospectuses)")
-            return
-        
         # Add VA Franklin County
-        va_franklin = Prospectus(
+        va_franklin = dict(
             prospectus_number="POH-09-VA25",
             agency="Veterans Affairs",
             location="Franklin County, OH",
@@ -50,16 +41,19 @@ def load_va_opportunities():
         )
         
         # Add VA Salt Lake City
-        va_salt_lake = Prospectus(
+        va_salt_lake = dict(
             prospectus_number="PUT-24-VA25",
             agency="Veterans Affairs", 
             location="Salt Lake City, UT",
             state="UT",
+            current_nusf=None,
             estimated_nusf=85046,
             estimated_rsf=114812,
             expansion_nusf=85046,
             estimated_annual_cost=7760000,
             rental_rate_per_nusf=91.24,
+            current_annual_cost=None,
+            current_lease_expiration=None,
             max_lease_term_years=20,
             parking_spaces=600,
             scoring_type="Operating Lease",
@@ -67,19 +61,32 @@ def load_va_opportunities():
             status="active"
         )
         
-        db.add(va_franklin)
-        db.add(va_salt_lake)
+        # Single round-trip: rows that already exist are skipped by the database
+        stmt = insert_for_dialect(Prospectus).values([va_franklin, va_salt_lake])
+        stmt = stmt.on_conflict_do_nothing(index_elements=["prospectus_number"])
+        stmt = stmt.returning(Prospectus.prospectus_number)
+        inserted = set(db.execute(stmt).scalars())
         db.commit()
         
+        labels = [("Franklin County VA", va_franklin), ("Salt Lake City VA", va_salt_lake)]
+        loaded = [(label, row) for label, row in labels if row["prospectus_number"] in inserted]
+        existing = len(labels) - len(loaded)
+        
+        if not loaded:
+            print(f"✅ Production data already exists ({existing} prospectuses)")
+            return
+        
         print("🎯 PRODUCTION DATA LOADED SUCCESSFULLY!")
         print("=" * 50)
-        print(f"✅ Franklin County VA: ${va_franklin.estimated_annual_cost:,.0f}/year")
-        print(f"   Your potential fee: ${va_franklin.estimated_annual_cost * 0.02:,.0f}")
-        print(f"✅ Salt Lake City VA: ${va_salt_lake.estimated_annual_cost:,.0f}/year")
-        print(f"   Your potential fee: ${va_salt_lake.estimated_annual_cost * 0.02:,.0f}")
+        for label, row in loaded:
+            print(f"✅ {label}: ${row['estimated_annual_cost']:,.0f}/year")
+            print(f"   Your potential fee: ${row['estimated_annual_cost'] * 0.02:,.0f}")
+        if existing:
+            print(f"ℹ️  {existing} prospectus(es) already existed and were skipped")
         print("=" * 50)
-        print(f"💰 Total Annual Value: ${va_franklin.estimated_annual_cost + va_salt_lake.estimated_annual_cost:,.0f}")
-        print(f"🏆 Total Potential Fees: ${(va_franklin.estimated_annual_cost + va_salt_lake.estimated_annual_cost) * 0.02:,.0f}")
+        total = sum(row["estimated_annual_cost"] for _, row in loaded)
+        print(f"💰 Total Annual Value: ${total:,.0f}")
+        print(f"🏆 Total Potential Fees: ${total * 0.02:,.0f}")
         
     except Exception as e:
         print(f"❌ Error loading data: {e}")
@@ -5,17 +5,44 @@ This script demonstrates the full end-to-end workflow of the LeaseHawk system
 """
 import sys
 import os
+import json
+import hashlib
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.notion_sync import NotionSync
 from app.matchers.property_matcher import PropertyMatcher
 from app.database import SessionLocal, engine
-from app.models import Base, Prospectus, Property, Match
+from app.models import init_db, Prospectus, Property, Match
 from datetime import datetime, timedelta
+from sqlalchemy import inspect
+
+ROW_HASH_FILE = "data/notion_row_hashes.json"
+MATCH_CHUNK_SIZE = 500
 
 def setup_database():
     """Ensure database tables exist"""
-    Base.metadata.create_all(bind=engine)
+    init_db(engine)
+
+def load_row_hashes():
+    """Load the Notion row fingerprints recorded by the previous run"""
+    try:
+        with open(ROW_HASH_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_row_hashes(row_hashes):
+    """Persist Notion row fingerprints so the next run can skip unchanged rows"""
+    os.makedirs("data", exist_ok=True)
+    with open(ROW_HASH_FILE, "w") as f:
+        json.dump(row_hashes, f)
+
+def row_fingerprint(row):
+    """Stable hash of a Notion row payload"""
+    payload = json.dumps(row, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 def run_complete_workflow():
     """Run the complete LeaseHawk workflow"""
@@ -30,8 +57,12 @@ def run_complete_workflow():
     print("\n📥 Step 1: Syncing from Notion...")
     try:
         notion = NotionSync()
-        prospectuses = notion.get_prospectuses()
-        properties = notion.get_properties()
+        # Both queries are independent Notion round-trips, so issue them together
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            prospectuses_future = pool.submit(notion.get_prospectuses)
+            properties_future = pool.submit(notion.get_properties)
+            prospectuses = prospectuses_future.result()
+            properties = properties_future.result()
         
         print(f"✅ Found {len(prospectuses)} prospectuses and {len(properties)} properties in Notion")
     except Exception as e:
@@ -44,12 +75,33 @@ def run_complete_workflow():
     db = SessionLocal()
     
     try:
-        # Add/update prospectuses
-        local_prospectuses = []
+        # Rows whose Notion payload is unchanged since the last run skip the
+        # per-row probe and are loaded together with a single IN query
+        row_hashes = load_row_hashes()
+        unchanged = {}
+        changed = []
         for p in prospectuses:
             if not p.get("prospectus_number"):
                 continue
-                
+            fingerprint = row_fingerprint(p)
+            if row_hashes.get(p["prospectus_number"]) == fingerprint:
+                unchanged[p["prospectus_number"]] = p
+            else:
+                row_hashes[p["prospectus_number"]] = fingerprint
+                changed.append(p)
+        
+        local_prospectuses = []
+        if unchanged:
+            local_prospectuses = db.query(Prospectus).filter(
+                Prospectus.prospectus_number.in_(list(unchanged))
+            ).all()
+            for prospectus in local_prospectuses:
+                unchanged.pop(prospectus.prospectus_number, None)
+            # Anything left was removed locally since the last run; re-create it
+            changed.extend(unchanged.values())
+        
+        # Add/update prospectuses
+        for p in changed:
             existing = db.query(Prospectus).filter(
                 Prospectus.prospectus_number == p["prospectus_number"]
             ).first()
@@ -86,6 +138,7 @@ def run_complete_workflow():
                 local_properties.append(existing)
         
         db.commit()
+        save_row_hashes(row_hashes)
         print(f"✅ Database updated with {len(local_prospectuses)} prospectuses and {len(local_properties)} properties")
         
     except Exception as e:
@@ -101,34 +154,56 @@ def run_complete_workflow():
     high_value_matches = []
     critical_alerts = []
     
-    for prospectus in local_prospectuses:
-        if not prospectus:
-            continue
-            
+    # Snapshot the clock once; every alert in this run shares the same cutoff
+    now = datetime.now()
+    alert_cutoff = now + timedelta(days=180)
+    
+    # Properties are the same for every prospectus; convert them once
+    property_dicts = [{c.name: getattr(prop, c.name) for c in prop.__table__.columns} 
+                      for prop in local_properties]
+    property_columns = matcher.build_columns(property_dicts)
+    
+    # Only properties in the prospectus' state (or with no state on record) can
+    # satisfy its delineated area, so index candidates by state up front
+    by_state, stateless_idx = matcher.index_by_state(property_dicts)
+    
+    # Stream prospectuses back in bounded chunks instead of holding every ORM
+    # object (and its identity-map entry) for the whole matching pass
+    # (identity keys avoid refreshing every object expired by the commit)
+    prospectus_ids = [inspect(p).identity[0] for p in local_prospectuses if p]
+    del local_prospectuses, local_properties
+    db.expunge_all()
+    
+    prospectus_stream = db.query(Prospectus).filter(
+        Prospectus.id.in_(prospectus_ids)
+    ).execution_options(stream_results=True).yield_per(MATCH_CHUNK_SIZE)
+    
+    match_rows = []
+    for prospectus in prospectus_stream:
         try:
             # Convert SQLAlchemy objects to dicts for matcher
             prospectus_dict = {c.name: getattr(prospectus, c.name) for c in prospectus.__table__.columns}
-            property_dicts = [{c.name: getattr(prop, c.name) for c in prop.__table__.columns} 
-                             for prop in local_properties]
             
             # Find matches
-            matches = matcher.find_matches(prospectus_dict, property_dicts)
+            state = (prospectus_dict.get('state') or '').upper()
+            candidate_idx = by_state.get(state, stateless_idx) if state else None
+            matches = matcher.find_matches(prospectus_dict, property_dicts,
+                                           columns=property_columns, candidate_idx=candidate_idx)
             
             for match in matches:
                 total_matches += 1
                 score = match['scores']['total_score']
                 
-                # Save match to database
-                db_match = Match(
-                    prospectus_id=prospectus.id,
-                    property_id=match['property']['id'],
-                    total_score=score,
-                    size_score=match['scores']['size_score'],
-                    parking_score=match['scores']['parking_score'],
-                    price_score=match['scores']['price_score'],
-                    location_score=match['scores']['location_score']
-                )
-                db.add(db_match)
+                # Queue match for the next bulk insert
+                match_rows.append({
+                    'prospectus_id': prospectus_dict['id'],
+                    'property_id': match['property']['id'],
+                    'total_score': score,
+                    'size_score': match['scores']['size_score'],
+                    'parking_score': match['scores']['parking_score'],
+                    'price_score': match['scores']['price_score'],
+                    'location_score': match['scores']['location_score']
+                })
                 
                 # Track high-value opportunities
                 annual_cost = prospectus_dict.get('estimated_annual_cost', 0)
@@ -141,21 +216,29 @@ def run_complete_workflow():
                     })
                 
                 # Track critical alerts (expiring soon + high value)
-                if prospectus.current_lease_expiration:
-                    days_until_exp = (prospectus.current_lease_expiration - datetime.now()).days
-                    if days_until_exp < 180 and annual_cost > 5000000:  # 6 months, $5M+
-                        critical_alerts.append({
-                            'prospectus': prospectus_dict,
-                            'property': match['property'],
-                            'score': score,
-                            'days_until_expiration': days_until_exp,
-                            'potential_fee': annual_cost * 0.02
-                        })
+                expiration = prospectus_dict['current_lease_expiration']
+                if expiration and expiration < alert_cutoff and annual_cost > 5000000:  # 6 months, $5M+
+                    days_until_exp = (expiration - now).days
+                    critical_alerts.append({
+                        'prospectus': prospectus_dict,
+                        'property': match['property'],
+                        'score': score,
+                        'days_until_expiration': days_until_exp,
+                        'potential_fee': annual_cost * 0.02
+                    })
         
         except Exception as e:
             print(f"❌ Error matching prospectus {prospectus.prospectus_number}: {e}")
-            continue
+        
+        finally:
+            db.expunge(prospectus)
+        
+        if len(match_rows) >= MATCH_CHUNK_SIZE:
+            db.bulk_insert_mappings(Match, match_rows)
+            match_rows = []
     
+    if match_rows:
+        db.bulk_insert_mappings(Match, match_rows)
     db.commit()
     print(f"✅ Matching complete: {total_matches} total matches found")
     
@@ -174,15 +257,15 @@ def run_complete_workflow():
             print(f"   Potential Fee: ${alert['potential_fee']:,.0f}")
             print()
     
+    # Only the top 10 by potential fee are ever displayed
+    top_high_value = heapq.nlargest(10, high_value_matches, key=lambda x: x['potential_fee'])
+    
     # High-value opportunities
     if high_value_matches:
         print(f"\n💰 HIGH-VALUE OPPORTUNITIES ({len(high_value_matches)} items):")
         print("=" * 50)
         
-        # Sort by potential fee
-        high_value_matches.sort(key=lambda x: x['potential_fee'], reverse=True)
-        
-        for i, hvm in enumerate(high_value_matches[:10], 1):  # Top 10
+        for i, hvm in enumerate(top_high_value, 1):  # Top 10
             print(f"{i:2d}. {hvm['prospectus']['agency']} - {hvm['prospectus']['location']}")
             print(f"     Annual Value: ${hvm['prospectus']['estimated_annual_cost']:,.0f}")
             print(f"     Property: {hvm['property']['address']}")
@@ -202,8 +285,7 @@ def run_complete_workflow():
     
     if high_value_matches:
         print("\n💼 HIGH-PRIORITY ACTIONS (This Week):")
-        top_matches = sorted(high_value_matches, key=lambda x: x['potential_fee'], reverse=True)[:5]
-        for i, match in enumerate(top_matches, 1):
+        for i, match in enumerate(top_high_value[:5], 1):
             print(f"{i}. Research property: {match['property']['address']}")
             print(f"   Draft LOI for {match['prospectus']['prospectus_number']}")
     
@@ -241,7 +323,8 @@ def run_daily_check():
     db = SessionLocal()
     
     # Get active prospectuses expiring in next 6 months
-    six_months_out = datetime.now() + timedelta(days=180)
+    now = datetime.now()
+    six_months_out = now + timedelta(days=180)
     expiring_soon = db.query(Prospectus).filter(
         Prospectus.current_lease_expiration <= six_months_out,
         Prospectus.status == "active"
@@ -255,7 +338,7 @@ def run_daily_check():
     if high_value_expiring:
         print(f"\n🎯 {len(high_value_expiring)} HIGH-VALUE expiring opportunities:")
         for p in high_value_expiring:
-            days_left = (p.current_lease_expiration - datetime.now()).days
+            days_left = (p.current_lease_expiration - now).days
             print(f"  • {p.agency} - {p.location} (${p.estimated_annual_cost:,.0f}, {days_left} days)")
     
     db.close()
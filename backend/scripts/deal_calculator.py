@@ -8,10 +8,203 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime, timedelta
-import json
+import orjson
+import re
+import shelve
+from collections import namedtuple
+import numpy as np
+from sqlalchemy import func, select
 from app.database import SessionLocal
 from app.models import Prospectus, Property, Match
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional - portfolio scoring falls back to NumPy expressions
+    njit = None
+    prange = range
+
+# Substring matches, applied to lowercased text
+HIGH_COMPETITION_RE = re.compile(r'washington|new york|los angeles|chicago|boston|san francisco')
+DOD_RE = re.compile(r'dod|defense')
+
+# Everything the portfolio view reads from a prospectus
+PORTFOLIO_COLUMNS = (
+    Prospectus.id, Prospectus.prospectus_number, Prospectus.agency, Prospectus.location,
+    Prospectus.state, Prospectus.estimated_annual_cost, Prospectus.estimated_nusf,
+    Prospectus.max_lease_term_years, Prospectus.current_lease_expiration
+)
+
+# Sidecar recording which saved analysis matches which portfolio fingerprint
+PORTFOLIO_CACHE_FILE = "data/portfolio_analysis.cache"
+
+# Clock-independent deal sections (overview, earnings) persisted across runs: one entry per
+# prospectus id, tagged with the updated_at it was computed from and replaced when that changes
+DEAL_CACHE_FILE = "data/deal_sections_cache.db"
+
+# One ranked row of the portfolio view; field order is the saved JSON key order
+DealRow = namedtuple('DealRow', [
+    'prospectus_number', 'location', 'annual_value', 'potential_earnings',
+    'risk_level', 'deal_rating', 'urgency_level'
+])
+
+# Sections of calculate_deal_value's DealAnalysis, tuple-backed like DealRow
+DealOverview = namedtuple('DealOverview', [
+    'prospectus_number', 'agency', 'location', 'square_footage', 'annual_lease_value',
+    'lease_term_years', 'total_lease_value', 'rent_per_sqft'
+])
+DealEarnings = namedtuple('DealEarnings', [
+    'finder_fee', 'consulting_fee', 'success_bonus', 'ongoing_annual_commission',
+    'total_upfront', 'total_ongoing', 'total_potential'
+])
+DealTimeline = namedtuple('DealTimeline', [
+    'urgency_level', 'days_until_expiration', 'rfp_expected', 'urgency_multiplier', 'time_to_prepare'
+])
+DealRisk = namedtuple('DealRisk', ['overall_risk', 'risk_level', 'risk_factors', 'mitigation_strategies'])
+MarketComparison = namedtuple('MarketComparison', [
+    'deal_size_vs_market', 'rent_vs_market', 'deal_attractiveness', 'market_position'
+])
+DealProfitability = namedtuple('DealProfitability', [
+    'roi_percentage', 'profit_per_hour', 'payback_period_months', 'risk_adjusted_value'
+])
+DealAnalysis = namedtuple('DealAnalysis', [
+    'opportunity_overview', 'your_potential_earnings', 'timeline_analysis',
+    'risk_assessment', 'market_comparison', 'profitability'
+])
+
+# Risk-factor categories, as bits, and the mitigation strategies each implies
+RISK_COMPETITION = 1
+RISK_SIZE_VALUE = 2
+RISK_TIMELINE = 4
+MITIGATION_STRATEGIES = {
+    RISK_COMPETITION: ("Early market entry and relationship building", "Unique value proposition development"),
+    RISK_SIZE_VALUE: ("Partner with established firms for large deals", "Focus on specialized requirements"),
+    RISK_TIMELINE: ("Immediate action plan with accelerated preparation", "Pre-qualified property options")
+}
+MITIGATION_BY_MASK = {
+    mask: tuple(strategy for bit, strategies in MITIGATION_STRATEGIES.items() if mask & bit for strategy in strategies)
+    for mask in range(8)
+}
+
+# One line of the portfolio table: rank, prospectus, location, annual value ($M), fee ($K), rating
+PORTFOLIO_ROW_FORMAT = "{:<4} {:<15} {:<20} ${:.1f}M       ${:.0f}K        {:<10}"
+
+# Label lookup tables for the integer codes produced by the portfolio scorers
+URGENCY_LEVELS = np.array(['Unknown', 'CRITICAL', 'HIGH', 'MEDIUM', 'LOW'])
+RISK_LEVELS = np.array(['LOW', 'MEDIUM', 'HIGH'])
+DEAL_RATINGS = np.array(['POOR', 'FAIR', 'GOOD', 'EXCELLENT'])
+
+def _portfolio_kernel(annual, sqft, term, days_until, has_expiration, is_dod, is_gsa, is_va,
+                      high_competition, upfront_rate, consulting_fee, ongoing_rate):
+    """Per-row deal scoring with the same if/elif ladders as the DealCalculator helpers.
+    
+    Returns total potential plus urgency, risk and rating codes (indices into the label tables).
+    """
+    n = annual.shape[0]
+    total_potential = np.empty(n)
+    urgency = np.empty(n, np.int8)
+    risk = np.empty(n, np.int8)
+    rating = np.empty(n, np.int8)
+    for i in prange(n):
+        value = annual[i]
+        days = days_until[i]
+        total_potential[i] = value * upfront_rate + consulting_fee + value * ongoing_rate * term[i]
+        
+        # calculate_timeline_value
+        if not has_expiration[i]:
+            u = 0
+        elif days < 180:
+            u = 1
+        elif days < 365:
+            u = 2
+        elif days < 730:
+            u = 3
+        else:
+            u = 4
+        urgency[i] = u
+        
+        # assess_deal_risk
+        score = 0.0
+        if sqft[i] > 200000:
+            score += 0.2
+        elif sqft[i] < 10000:
+            score += 0.1
+        if value > 20000000:
+            score += 0.3
+        elif value < 500000:
+            score += 0.2
+        if high_competition[i]:
+            score += 0.3
+        if is_dod[i]:
+            score += 0.2
+        elif is_gsa[i] and value > 10000000:
+            score += 0.2
+        if has_expiration[i] and days != 0 and days < 90:
+            score += 0.3
+        if score > 0.6:
+            risk[i] = 2
+        elif score > 0.3:
+            risk[i] = 1
+        else:
+            risk[i] = 0
+        
+        # rate_deal_attractiveness
+        points = 0
+        if value > 10000000:
+            points += 3
+        elif value > 5000000:
+            points += 2
+        elif value > 2000000:
+            points += 1
+        if u == 1 or u == 2:
+            points += 2
+        elif u == 3:
+            points += 1
+        if is_va[i]:
+            points += 2
+        elif is_gsa[i]:
+            points += 1
+        if points >= 7:
+            rating[i] = 3
+        elif points >= 5:
+            rating[i] = 2
+        elif points >= 3:
+            rating[i] = 1
+        else:
+            rating[i] = 0
+    return total_potential, urgency, risk, rating
+
+def _portfolio_scores_numpy(annual, sqft, term, days_until, has_expiration, is_dod, is_gsa, is_va,
+                            high_competition, upfront_rate, consulting_fee, ongoing_rate):
+    """Whole-array equivalent of _portfolio_kernel for when numba is unavailable"""
+    total_potential = annual * upfront_rate + consulting_fee + annual * ongoing_rate * term
+    
+    urgency = np.select(
+        [~has_expiration, days_until < 180, days_until < 365, days_until < 730],
+        [0, 1, 2, 3],
+        4
+    )
+    
+    # Terms added in the same order as assess_deal_risk so float sums match
+    score = np.zeros(annual.shape[0])
+    score += np.select([sqft > 200000, sqft < 10000], [0.2, 0.1], 0.0)
+    score += np.select([annual > 20000000, annual < 500000], [0.3, 0.2], 0.0)
+    score += np.where(high_competition, 0.3, 0.0)
+    score += np.where(is_dod | (is_gsa & (annual > 10000000)), 0.2, 0.0)
+    score += np.where(has_expiration & (days_until != 0) & (days_until < 90), 0.3, 0.0)
+    risk = np.select([score > 0.6, score > 0.3], [2, 1], 0)
+    
+    points = np.select([annual > 10000000, annual > 5000000, annual > 2000000], [3, 2, 1], 0)
+    points += np.select([(urgency == 1) | (urgency == 2), urgency == 3], [2, 1], 0)
+    points += np.select([is_va, is_gsa], [2, 1], 0)
+    rating = np.select([points >= 7, points >= 5, points >= 3], [3, 2, 1], 0)
+    
+    return total_potential, urgency, risk, rating
+
+if njit is not None:
+    score_portfolio = njit(cache=True, parallel=True)(_portfolio_kernel)
+else:
+    score_portfolio = _portfolio_scores_numpy
+
 class DealCalculator:
     def __init__(self):
         self.fee_structures = {
@@ -20,133 +213,229 @@ class DealCalculator:
             'success_bonus': 0.01,    # 1% success fee
             'ongoing_commission': 0.005  # 0.5% of annual rent for ongoing management
         }
+        # Fee rates hoisted out of the dict for the per-deal hot path
+        self._finder_rate = self.fee_structures['finder_fee']
+        self._success_rate = self.fee_structures['success_bonus']
+        self._ongoing_rate = self.fee_structures['ongoing_commission']
+        self._consulting_fee = self.fee_structures['consulting_fee']
+        self._upfront_rate = self._finder_rate + self._success_rate
+        
+        # Timeline results per (prospectus id, expiration), all measured from self._now
+        self._timeline_cache = {}
+        self._disk_cache = None  # opened on first use, see _deal_cache
+        self.set_clock(datetime.now())
+    
+    def set_clock(self, now):
+        """Measure every timeline from `now`; precomputes the urgency cutoff dates"""
+        self._now = now
+        self._critical_cutoff = now + timedelta(days=180)
+        self._high_cutoff = now + timedelta(days=365)
+        self._medium_cutoff = now + timedelta(days=730)
+        self._timeline_cache.clear()
     
     def calculate_deal_value(self, prospectus, detailed=True):
         """Calculate comprehensive deal value and your potential earnings"""
         
+        # Overview and earnings come from the row alone and are cached on disk; the timeline,
+        # risk, market and profitability sections depend on the clock and are always recomputed
+        static = self._load_cached_deal(prospectus)
+        if static is None:
+            static = self._compute_static_sections(prospectus)
+            self._store_cached_deal(prospectus, static)
+        analysis = DealAnalysis(*static, *self._compute_timed_sections(prospectus, *static))
+        
+        if detailed:
+            self.print_deal_analysis(analysis)
+        
+        return analysis
+    
+    def _deal_cache(self):
+        """The DEAL_CACHE_FILE shelf, opened on first use"""
+        if self._disk_cache is None:
+            os.makedirs("data", exist_ok=True)
+            self._disk_cache = shelve.open(DEAL_CACHE_FILE)
+        return self._disk_cache
+    
+    def _load_cached_deal(self, prospectus):
+        """(overview, earnings) saved for this prospectus version, or None
+        
+        updated_at changes on every UPDATE of the row (onupdate), so an edited deal misses.
+        """
+        updated_at = getattr(prospectus, 'updated_at', None)
+        if prospectus.id is None or updated_at is None:
+            return None
+        stored = self._deal_cache().get(str(prospectus.id))
+        if stored is None or stored[0] != updated_at.isoformat():
+            return None
+        try:
+            return DealOverview(*stored[1]), DealEarnings(*stored[2])
+        except TypeError:  # saved by an older layout
+            return None
+    
+    def _store_cached_deal(self, prospectus, static):
+        """Save (overview, earnings), replacing any entry for an older version of the prospectus"""
+        updated_at = getattr(prospectus, 'updated_at', None)
+        if prospectus.id is None or updated_at is None:
+            return
+        # Plain tuples so the shelf loads whether this module runs as a script or is imported
+        overview, earnings = static
+        self._deal_cache()[str(prospectus.id)] = (updated_at.isoformat(), tuple(overview), tuple(earnings))
+    
+    def close(self):
+        """Flush and close the deal cache"""
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+    
+    def _compute_static_sections(self, prospectus):
+        """The overview and earnings sections of calculate_deal_value (independent of the clock)"""
         annual_value = prospectus.estimated_annual_cost or 0
         lease_term = prospectus.max_lease_term_years or 10
         sqft = prospectus.estimated_nusf or 0
+        rent_per_sqft = annual_value / sqft if sqft > 0 else 0
         
-        # Basic calculations
-        calculations = {
-            'opportunity_overview': {
-                'prospectus_number': prospectus.prospectus_number,
-                'agency': prospectus.agency,
-                'location': f"{prospectus.location}, {prospectus.state}",
-                'square_footage': sqft,
-                'annual_lease_value': annual_value,
-                'lease_term_years': lease_term,
-                'total_lease_value': annual_value * lease_term,
-                'rent_per_sqft': annual_value / sqft if sqft > 0 else 0
-            },
-            
-            'your_potential_earnings': {
-                'finder_fee': annual_value * self.fee_structures['finder_fee'],
-                'consulting_fee': self.fee_structures['consulting_fee'],
-                'success_bonus': annual_value * self.fee_structures['success_bonus'],
-                'ongoing_annual_commission': annual_value * self.fee_structures['ongoing_commission'],
-                'total_upfront': 0,  # Will calculate below
-                'total_ongoing': 0,  # Will calculate below
-                'total_potential': 0  # Will calculate below
-            },
-            
-            'timeline_analysis': self.calculate_timeline_value(prospectus),
-            'risk_assessment': self.assess_deal_risk(prospectus),
-            'market_comparison': self.compare_to_market(prospectus)
-        }
+        overview = DealOverview(
+            prospectus_number=prospectus.prospectus_number,
+            agency=prospectus.agency,
+            location=f"{prospectus.location}, {prospectus.state}",
+            square_footage=sqft,
+            annual_lease_value=annual_value,
+            lease_term_years=lease_term,
+            total_lease_value=annual_value * lease_term,
+            rent_per_sqft=rent_per_sqft
+        )
         
-        # Calculate totals
-        earnings = calculations['your_potential_earnings']
-        earnings['total_upfront'] = (
-            earnings['finder_fee'] + 
-            earnings['consulting_fee'] + 
-            earnings['success_bonus']
+        total_upfront = annual_value * self._upfront_rate + self._consulting_fee
+        ongoing_annual = annual_value * self._ongoing_rate
+        total_ongoing = ongoing_annual * lease_term
+        earnings = DealEarnings(
+            finder_fee=annual_value * self._finder_rate,
+            consulting_fee=self._consulting_fee,
+            success_bonus=annual_value * self._success_rate,
+            ongoing_annual_commission=ongoing_annual,
+            total_upfront=total_upfront,
+            total_ongoing=total_ongoing,
+            total_potential=total_upfront + total_ongoing
         )
-        earnings['total_ongoing'] = earnings['ongoing_annual_commission'] * lease_term
-        earnings['total_potential'] = earnings['total_upfront'] + earnings['total_ongoing']
-        
-        # Add profitability metrics
-        calculations['profitability'] = {
-            'roi_percentage': (earnings['total_potential'] / max(earnings['consulting_fee'], 1)) * 100,
-            'profit_per_hour': self.estimate_profit_per_hour(earnings['total_potential']),
-            'payback_period_months': self.estimate_payback_period(earnings),
-            'risk_adjusted_value': earnings['total_potential'] * (1 - calculations['risk_assessment']['overall_risk'])
-        }
         
-        if detailed:
-            self.print_deal_analysis(calculations)
+        return overview, earnings
+    
+    def _compute_timed_sections(self, prospectus, overview, earnings):
+        """The timeline, risk, market and profitability sections, measured from self._now"""
+        annual_value = overview.annual_lease_value
+        sqft = overview.square_footage
+        rent_per_sqft = overview.rent_per_sqft
+        total_potential = earnings.total_potential
+        agency = (prospectus.agency or '').lower()
+        location = (prospectus.location or '').lower()
         
-        return calculations
+        timeline = self.calculate_timeline_value(prospectus)
+        risk = self._assess_risk(sqft, annual_value, location, agency, timeline.days_until_expiration)
+        market = self._compare_to_market(
+            annual_value, rent_per_sqft,
+            self._rate_attractiveness(annual_value, timeline.urgency_level, agency)
+        )
+        
+        profitability = DealProfitability(
+            roi_percentage=(total_potential / max(self._consulting_fee, 1)) * 100,
+            profit_per_hour=self.estimate_profit_per_hour(total_potential),
+            payback_period_months=self.estimate_payback_period(earnings),
+            risk_adjusted_value=total_potential * (1 - risk.overall_risk)
+        )
+        
+        return timeline, risk, market, profitability
     
     def calculate_timeline_value(self, prospectus):
         """Analyze timeline impact on deal value"""
         
+        key = (prospectus.id, prospectus.current_lease_expiration)
+        if key not in self._timeline_cache:
+            self._timeline_cache[key] = self._compute_timeline_value(prospectus)
+        return self._timeline_cache[key]
+    
+    def _compute_timeline_value(self, prospectus):
+        """Uncached body of calculate_timeline_value"""
+        
         if not prospectus.current_lease_expiration:
-            return {
-                'urgency_level': 'Unknown',
-                'days_until_expiration': None,
-                'rfp_timeline': 'TBD',
-                'urgency_multiplier': 1.0
-            }
+            return DealTimeline(
+                urgency_level='Unknown',
+                days_until_expiration=None,
+                rfp_expected=None,  # RFP timing TBD
+                urgency_multiplier=1.0,
+                time_to_prepare=None
+            )
         
-        days_until = (prospectus.current_lease_expiration - datetime.now()).days
+        expiration = prospectus.current_lease_expiration
+        days_until = (expiration - self._now).days
         
-        if days_until < 180:
+        # expiration < now + N days  <=>  (expiration - now).days < N
+        if expiration < self._critical_cutoff:
             urgency_level = 'CRITICAL'
             urgency_multiplier = 1.3  # 30% bonus for urgent deals
-        elif days_until < 365:
+        elif expiration < self._high_cutoff:
             urgency_level = 'HIGH'
             urgency_multiplier = 1.2  # 20% bonus
-        elif days_until < 730:
+        elif expiration < self._medium_cutoff:
             urgency_level = 'MEDIUM'
             urgency_multiplier = 1.1  # 10% bonus
         else:
             urgency_level = 'LOW'
             urgency_multiplier = 1.0
         
-        return {
-            'urgency_level': urgency_level,
-            'days_until_expiration': days_until,
-            'rfp_expected': prospectus.current_lease_expiration - timedelta(days=270),
-            'urgency_multiplier': urgency_multiplier,
-            'time_to_prepare': max(days_until - 270, 0)  # Time before RFP
-        }
+        return DealTimeline(
+            urgency_level=urgency_level,
+            days_until_expiration=days_until,
+            rfp_expected=expiration - timedelta(days=270),
+            urgency_multiplier=urgency_multiplier,
+            time_to_prepare=max(days_until - 270, 0)  # Time before RFP
+        )
     
     def assess_deal_risk(self, prospectus):
         """Assess risk factors for the deal"""
         
+        timeline = self.calculate_timeline_value(prospectus)
+        return self._assess_risk(
+            prospectus.estimated_nusf or 0,
+            prospectus.estimated_annual_cost or 0,
+            (prospectus.location or '').lower(),
+            (prospectus.agency or '').lower(),
+            timeline.days_until_expiration
+        )
+    
+    def _assess_risk(self, sqft, annual_value, location, agency, days_until):
+        """assess_deal_risk on pre-extracted values (location and agency lowercased)"""
+        
         risk_factors = []
         risk_score = 0.0  # 0 = no risk, 1 = maximum risk
+        risk_mask = 0  # RISK_* categories that fired, for suggest_risk_mitigation
         
         # Size risk
-        sqft = prospectus.estimated_nusf or 0
         if sqft > 200000:
             risk_factors.append("Large size increases competition")
             risk_score += 0.2
+            risk_mask |= RISK_COMPETITION
         elif sqft < 10000:
             risk_factors.append("Very small - may not be worth effort")
             risk_score += 0.1
         
         # Value risk
-        annual_value = prospectus.estimated_annual_cost or 0
         if annual_value > 20000000:
             risk_factors.append("High value attracts major players")
             risk_score += 0.3
+            risk_mask |= RISK_SIZE_VALUE
         elif annual_value < 500000:
             risk_factors.append("Low value - minimal fees")
             risk_score += 0.2
+            risk_mask |= RISK_SIZE_VALUE
         
         # Location risk
-        location = (prospectus.location or '').lower()
-        high_competition_areas = ['washington', 'new york', 'los angeles', 'chicago', 'boston', 'san francisco']
-        if any(area in location for area in high_competition_areas):
+        if HIGH_COMPETITION_RE.search(location):
             risk_factors.append("Major metro area - high competition")
             risk_score += 0.3
+            risk_mask |= RISK_COMPETITION
         
         # Agency risk
-        agency = (prospectus.agency or '').lower()
-        if 'dod' in agency or 'defense' in agency:
+        if DOD_RE.search(agency):
             risk_factors.append("DoD contracts are highly competitive")
             risk_score += 0.2
         elif 'gsa' in agency and annual_value > 10000000:
@@ -154,10 +443,10 @@ class DealCalculator:
             risk_score += 0.2
         
         # Timeline risk
-        timeline = self.calculate_timeline_value(prospectus)
-        if timeline['days_until_expiration'] and timeline['days_until_expiration'] < 90:
+        if days_until and days_until < 90:
             risk_factors.append("Very short timeline - limited preparation time")
             risk_score += 0.3
+            risk_mask |= RISK_TIMELINE
         
         risk_level = 'LOW'
         if risk_score > 0.6:
@@ -165,30 +454,16 @@ class DealCalculator:
         elif risk_score > 0.3:
             risk_level = 'MEDIUM'
         
-        return {
-            'overall_risk': min(risk_score, 1.0),
-            'risk_level': risk_level,
-            'risk_factors': risk_factors,
-            'mitigation_strategies': self.suggest_risk_mitigation(risk_factors)
-        }
+        return DealRisk(
+            overall_risk=min(risk_score, 1.0),
+            risk_level=risk_level,
+            risk_factors=risk_factors,
+            mitigation_strategies=self.suggest_risk_mitigation(risk_mask)
+        )
     
-    def suggest_risk_mitigation(self, risk_factors):
-        """Suggest strategies to mitigate identified risks"""
-        
-        strategies = []
-        
-        for factor in risk_factors:
-            if 'competition' in factor.lower():
-                strategies.append("Early market entry and relationship building")
-                strategies.append("Unique value proposition development")
-            elif 'size' in factor.lower() or 'value' in factor.lower():
-                strategies.append("Partner with established firms for large deals")
-                strategies.append("Focus on specialized requirements")
-            elif 'timeline' in factor.lower():
-                strategies.append("Immediate action plan with accelerated preparation")
-                strategies.append("Pre-qualified property options")
-        
-        return list(set(strategies))  # Remove duplicates
+    def suggest_risk_mitigation(self, risk_mask):
+        """Suggest strategies to mitigate identified risks (risk_mask: RISK_* bits from assess_deal_risk)"""
+        return list(MITIGATION_BY_MASK[risk_mask])
     
     def compare_to_market(self, prospectus):
         """Compare deal to market standards"""
@@ -196,6 +471,10 @@ class DealCalculator:
         annual_value = prospectus.estimated_annual_cost or 0
         sqft = prospectus.estimated_nusf or 0
         rent_per_sqft = annual_value / sqft if sqft > 0 else 0
+        return self._compare_to_market(annual_value, rent_per_sqft, self.rate_deal_attractiveness(prospectus))
+    
+    def _compare_to_market(self, annual_value, rent_per_sqft, attractiveness):
+        """compare_to_market on pre-extracted values"""
         
         # Market benchmarks (these would come from real data in production)
         market_benchmarks = {
@@ -205,18 +484,27 @@ class DealCalculator:
             'average_finder_fee': 100000
         }
         
-        return {
-            'deal_size_vs_market': annual_value / market_benchmarks['average_deal_size'],
-            'rent_vs_market': rent_per_sqft / market_benchmarks['average_rent_psf'] if rent_per_sqft > 0 else 0,
-            'deal_attractiveness': self.rate_deal_attractiveness(prospectus),
-            'market_position': 'Above Average' if annual_value > market_benchmarks['average_deal_size'] else 'Below Average'
-        }
+        return MarketComparison(
+            deal_size_vs_market=annual_value / market_benchmarks['average_deal_size'],
+            rent_vs_market=rent_per_sqft / market_benchmarks['average_rent_psf'] if rent_per_sqft > 0 else 0,
+            deal_attractiveness=attractiveness,
+            market_position='Above Average' if annual_value > market_benchmarks['average_deal_size'] else 'Below Average'
+        )
     
     def rate_deal_attractiveness(self, prospectus):
         """Rate the overall attractiveness of the deal"""
         
+        timeline = self.calculate_timeline_value(prospectus)
+        return self._rate_attractiveness(
+            prospectus.estimated_annual_cost or 0,
+            timeline.urgency_level,
+            (prospectus.agency or '').lower()
+        )
+    
+    def _rate_attractiveness(self, annual_value, urgency_level, agency):
+        """rate_deal_attractiveness on pre-extracted values (agency lowercased)"""
+        
         score = 0
-        annual_value = prospectus.estimated_annual_cost or 0
         
         # Value scoring
         if annual_value > 10000000:
@@ -227,14 +515,12 @@ class DealCalculator:
             score += 1
         
         # Timeline scoring
-        timeline = self.calculate_timeline_value(prospectus)
-        if timeline['urgency_level'] in ['CRITICAL', 'HIGH']:
+        if urgency_level in ['CRITICAL', 'HIGH']:
             score += 2
-        elif timeline['urgency_level'] == 'MEDIUM':
+        elif urgency_level == 'MEDIUM':
             score += 1
         
         # Agency scoring
-        agency = (prospectus.agency or '').lower()
         if 'va' in agency:
             score += 2  # VA deals often have less competition
         elif 'gsa' in agency:
@@ -269,65 +555,119 @@ class DealCalculator:
         """Estimate how long to recoup initial investment"""
         
         # Assume initial investment is mostly time (opportunity cost)
-        initial_investment = earnings['consulting_fee']  # Use consulting fee as proxy
-        monthly_return = earnings['total_upfront'] / 6  # Assume 6 months to close
+        initial_investment = earnings.consulting_fee  # Use consulting fee as proxy
+        monthly_return = earnings.total_upfront / 6  # Assume 6 months to close
         
         if monthly_return > 0:
             return initial_investment / monthly_return
         else:
             return 12  # Default to 12 months if calculation fails
     
-    def print_deal_analysis(self, calculations):
+    def print_deal_analysis(self, analysis):
         """Print formatted deal analysis"""
         
-        overview = calculations['opportunity_overview']
-        earnings = calculations['your_potential_earnings']
-        timeline = calculations['timeline_analysis']
-        risk = calculations['risk_assessment']
-        profitability = calculations['profitability']
+        overview = analysis.opportunity_overview
+        earnings = analysis.your_potential_earnings
+        timeline = analysis.timeline_analysis
+        risk = analysis.risk_assessment
+        profitability = analysis.profitability
+        
+        lines = []
+        
+        lines.append(f"\n🎯 DEAL ANALYSIS: {overview.prospectus_number}")
+        lines.append("=" * 60)
+        
+        lines.append(f"📍 Location: {overview.location}")
+        lines.append(f"🏢 Size: {overview.square_footage:,} sq ft")
+        lines.append(f"💰 Annual Value: ${overview.annual_lease_value:,.0f}")
+        lines.append(f"📅 Lease Term: {overview.lease_term_years} years")
+        lines.append(f"💵 Total Value: ${overview.total_lease_value:,.0f}")
+        lines.append(f"📊 Rate: ${overview.rent_per_sqft:.2f}/sq ft")
+        
+        lines.append(f"\n💼 YOUR POTENTIAL EARNINGS:")
+        lines.append(f"   Finder's Fee (2%): ${earnings.finder_fee:,.0f}")
+        lines.append(f"   Consulting Fee: ${earnings.consulting_fee:,.0f}")
+        lines.append(f"   Success Bonus (1%): ${earnings.success_bonus:,.0f}")
+        lines.append(f"   ─────────────────────────────────")
+        lines.append(f"   UPFRONT TOTAL: ${earnings.total_upfront:,.0f}")
+        lines.append(f"   Ongoing Annual: ${earnings.ongoing_annual_commission:,.0f}")
+        lines.append(f"   GRAND TOTAL: ${earnings.total_potential:,.0f}")
+        
+        lines.append(f"\n⏰ TIMELINE ANALYSIS:")
+        lines.append(f"   Urgency Level: {timeline.urgency_level}")
+        if timeline.days_until_expiration:
+            lines.append(f"   Days Until Expiration: {timeline.days_until_expiration}")
+        lines.append(f"   Urgency Multiplier: {timeline.urgency_multiplier:.1f}x")
+        
+        lines.append(f"\n⚠️  RISK ASSESSMENT: {risk.risk_level}")
+        if risk.risk_factors:
+            lines.append(f"   Risk Factors:")
+            for factor in risk.risk_factors:
+                lines.append(f"     • {factor}")
+        
+        lines.append(f"\n📈 PROFITABILITY METRICS:")
+        lines.append(f"   ROI: {profitability.roi_percentage:.0f}%")
+        lines.append(f"   Profit/Hour: ${profitability.profit_per_hour:,.0f}")
+        lines.append(f"   Payback: {profitability.payback_period_months:.1f} months")
+        lines.append(f"   Risk-Adjusted Value: ${profitability.risk_adjusted_value:,.0f}")
         
-        print(f"\n🎯 DEAL ANALYSIS: {overview['prospectus_number']}")
-        print("=" * 60)
+        # Deal rating
+        market = analysis.market_comparison
+        lines.append(f"\n⭐ DEAL RATING: {market.deal_attractiveness}")
         
-        print(f"📍 Location: {overview['location']}")
-        print(f"🏢 Size: {overview['square_footage']:,} sq ft")
-        print(f"💰 Annual Value: ${overview['annual_lease_value']:,.0f}")
-        print(f"📅 Lease Term: {overview['lease_term_years']} years")
-        print(f"💵 Total Value: ${overview['total_lease_value']:,.0f}")
-        print(f"📊 Rate: ${overview['rent_per_sqft']:.2f}/sq ft")
-        
-        print(f"\n💼 YOUR POTENTIAL EARNINGS:")
-        print(f"   Finder's Fee (2%): ${earnings['finder_fee']:,.0f}")
-        print(f"   Consulting Fee: ${earnings['consulting_fee']:,.0f}")
-        print(f"   Success Bonus (1%): ${earnings['success_bonus']:,.0f}")
-        print(f"   ─────────────────────────────────")
-        print(f"   UPFRONT TOTAL: ${earnings['total_upfront']:,.0f}")
-        print(f"   Ongoing Annual: ${earnings['ongoing_annual_commission']:,.0f}")
-        print(f"   GRAND TOTAL: ${earnings['total_potential']:,.0f}")
-        
-        print(f"\n⏰ TIMELINE ANALYSIS:")
-        print(f"   Urgency Level: {timeline['urgency_level']}")
-        if timeline['days_until_expiration']:
-            print(f"   Days Until Expiration: {timeline['days_until_expiration']}")
-        print(f"   Urgency Multiplier: {timeline['urgency_multiplier']:.1f}x")
-        
-        print(f"\n⚠️  RISK ASSESSMENT: {risk['risk_level']}")
-        if risk['risk_factors']:
-            print(f"   Risk Factors:")
-            for factor in risk['risk_factors']:
-                print(f"     • {factor}")
-        
-        print(f"\n📈 PROFITABILITY METRICS:")
-        print(f"   ROI: {profitability['roi_percentage']:.0f}%")
-        print(f"   Profit/Hour: ${profitability['profit_per_hour']:,.0f}")
-        print(f"   Payback: {profitability['payback_period_months']:.1f} months")
-        print(f"   Risk-Adjusted Value: ${profitability['risk_adjusted_value']:,.0f}")
+        sys.stdout.write("\n".join(lines) + "\n")
         
-        # Deal rating
-        market = calculations['market_comparison']
-        print(f"\n⭐ DEAL RATING: {market['deal_attractiveness']}")
+        return analysis
+    
+    def calculate_portfolio_columns(self, prospectuses):
+        """Vectorized calculate_deal_value over a whole portfolio (Prospectus objects or PORTFOLIO_COLUMNS rows).
+        
+        Computes only what the portfolio view consumes, one NumPy column per field,
+        scored by score_portfolio (the numba kernel when available).
+        """
+        n = len(prospectuses)
+        now = np.datetime64(self._now, 'us')
+        
+        annual = np.fromiter((p.estimated_annual_cost or 0 for p in prospectuses), dtype=np.float64, count=n)
+        # Dollar columns stay float64 (float32 drops whole dollars above ~$16M); the
+        # integer columns (sqft, lease term, days) are narrowed to int32
+        sqft = np.fromiter((p.estimated_nusf or 0 for p in prospectuses), dtype=np.int32, count=n)
+        term = np.fromiter((p.max_lease_term_years or 10 for p in prospectuses), dtype=np.int32, count=n)
+        expiration = np.array([p.current_lease_expiration or 'NaT' for p in prospectuses], dtype='datetime64[us]')
+        
+        # Categorical flags - the only per-row string work left
+        agencies = [(p.agency or '').lower() for p in prospectuses]
+        is_dod = np.fromiter((DOD_RE.search(a) is not None for a in agencies), dtype=bool, count=n)
+        is_gsa = np.fromiter(('gsa' in a for a in agencies), dtype=bool, count=n)
+        is_va = np.fromiter(('va' in a for a in agencies), dtype=bool, count=n)
+        high_competition = np.fromiter(
+            (HIGH_COMPETITION_RE.search((p.location or '').lower()) is not None for p in prospectuses),
+            dtype=bool, count=n
+        )
+        
+        # Timeline (timedelta.days floors, and so does integer division of datetime64)
+        has_expiration = ~np.isnat(expiration)
+        days_until = (np.where(has_expiration, expiration, now) - now) // np.timedelta64(1, 'D')
         
-        return calculations
+        total_potential, urgency, risk, rating = score_portfolio(
+            annual, sqft, term, days_until.astype(np.int32), has_expiration,
+            is_dod, is_gsa, is_va, high_competition,
+            self._upfront_rate, float(self._consulting_fee), self._ongoing_rate
+        )
+        
+        return {
+            'annual_value': annual,
+            'total_potential': total_potential,
+            'urgency_level': URGENCY_LEVELS[urgency],
+            'risk_level': RISK_LEVELS[risk],
+            'deal_rating': DEAL_RATINGS[rating]
+        }
+    
+    def total_potential_expr(self):
+        """SQL expression for calculate_deal_value's total_potential, so the database can rank deals"""
+        annual = func.coalesce(Prospectus.estimated_annual_cost, 0)
+        term = func.coalesce(Prospectus.max_lease_term_years, 10)
+        return annual * self._upfront_rate + self._consulting_fee + annual * self._ongoing_rate * term
     
     def analyze_portfolio(self):
         """Analyze entire portfolio of opportunities"""
@@ -335,90 +675,129 @@ class DealCalculator:
         print("🦅 PORTFOLIO ANALYSIS - ALL OPPORTUNITIES")
         print("=" * 60)
         
+        # Fresh clock (and timeline cache) for this run
+        self.set_clock(datetime.now())
+        
         db = SessionLocal()
         
         try:
-            prospectuses = db.query(Prospectus).filter(
+            # Reuse the last saved analysis if the active portfolio hasn't changed
+            cache_key = self._portfolio_cache_key(db)
+            cached = self._load_cached_portfolio(cache_key)
+            if cached is not None:
+                portfolio_data, total_potential, filename = cached
+                print(f"♻️  Portfolio unchanged - reusing {filename}\n")
+                self.print_portfolio(portfolio_data, total_potential)
+                return
+            
+            # Ranked by potential earnings in SQL (id breaks ties deterministically).
+            # Plain rows with just the PORTFOLIO_COLUMNS - no ORM objects or identity map
+            stmt = select(*PORTFOLIO_COLUMNS).where(
                 Prospectus.status == 'active'
-            ).all()
+            ).order_by(self.total_potential_expr().desc(), Prospectus.id)
+            prospectuses = db.execute(stmt.execution_options(yield_per=1000)).all()
             
             if not prospectuses:
                 print("❌ No active prospectuses found")
                 return
             
-            portfolio_data = []
-            total_potential = 0
-            
             print(f"📊 Analyzing {len(prospectuses)} opportunities...\n")
             
-            for prospectus in prospectuses:
-                deal_calc = self.calculate_deal_value(prospectus, detailed=False)
-                portfolio_data.append(deal_calc)
-                total_potential += deal_calc['your_potential_earnings']['total_potential']
-            
-            # Sort by potential earnings
-            portfolio_data.sort(
-                key=lambda x: x['your_potential_earnings']['total_potential'], 
-                reverse=True
-            )
-            
-            # Print summary table
-            print(f"{'Rank':<4} {'Prospectus':<15} {'Location':<20} {'Annual Value':<12} {'Your Fee':<12} {'Rating':<10}")
-            print("-" * 85)
-            
-            for i, deal in enumerate(portfolio_data, 1):
-                overview = deal['opportunity_overview']
-                earnings = deal['your_potential_earnings']
-                rating = deal['market_comparison']['deal_attractiveness']
-                
-                print(f"{i:<4} {overview['prospectus_number'][:14]:<15} "
-                      f"{overview['location'][:19]:<20} "
-                      f"${overview['annual_lease_value']/1000000:.1f}M{'':<6} "
-                      f"${earnings['total_potential']/1000:.0f}K{'':<7} "
-                      f"{rating:<10}")
-            
-            # Portfolio summary
-            print(f"\n💰 PORTFOLIO SUMMARY:")
-            print(f"   Total Opportunities: {len(portfolio_data)}")
-            print(f"   Total Potential Earnings: ${total_potential:,.0f}")
-            print(f"   Average per Deal: ${total_potential/len(portfolio_data):,.0f}")
-            
-            # Top opportunities
-            top_5 = portfolio_data[:5]
-            top_5_total = sum(d['your_potential_earnings']['total_potential'] for d in top_5)
-            
-            print(f"\n🎯 TOP 5 OPPORTUNITIES (${top_5_total:,.0f} potential):")
-            for i, deal in enumerate(top_5, 1):
-                overview = deal['opportunity_overview']
-                earnings = deal['your_potential_earnings']
-                timeline = deal['timeline_analysis']
-                
-                print(f"{i}. {overview['prospectus_number']} - {overview['location']}")
-                print(f"   Potential: ${earnings['total_potential']:,.0f} | "
-                      f"Urgency: {timeline['urgency_level']}")
+            columns = self.calculate_portfolio_columns(prospectuses)
+            total_potential = float(columns['total_potential'].sum())
             
-            # Risk analysis
-            high_risk = [d for d in portfolio_data if d['risk_assessment']['risk_level'] == 'HIGH']
-            low_risk = [d for d in portfolio_data if d['risk_assessment']['risk_level'] == 'LOW']
+            portfolio_data = [
+                DealRow(p.prospectus_number, f"{p.location}, {p.state}", annual, potential, risk, rating, urgency)
+                for p, annual, potential, risk, rating, urgency in zip(
+                    prospectuses,
+                    columns['annual_value'].tolist(),
+                    columns['total_potential'].tolist(),
+                    columns['risk_level'].tolist(),
+                    columns['deal_rating'].tolist(),
+                    columns['urgency_level'].tolist()
+                )
+            ]
             
-            print(f"\n⚠️  RISK DISTRIBUTION:")
-            print(f"   Low Risk: {len(low_risk)} deals")
-            print(f"   Medium Risk: {len(portfolio_data) - len(high_risk) - len(low_risk)} deals")
-            print(f"   High Risk: {len(high_risk)} deals")
-            
-            # Action recommendations
-            print(f"\n🚀 RECOMMENDED ACTION PLAN:")
-            print(f"1. Focus on top 3 opportunities: ${sum(d['your_potential_earnings']['total_potential'] for d in top_5[:3]):,.0f}")
-            print(f"2. Prioritize {len([d for d in top_5 if d['timeline_analysis']['urgency_level'] in ['CRITICAL', 'HIGH']])} urgent deals")
-            print(f"3. Target low-risk, high-value opportunities first")
+            self.print_portfolio(portfolio_data, total_potential)
             
             # Save portfolio analysis
-            self.save_portfolio_analysis(portfolio_data, total_potential)
+            self.save_portfolio_analysis(portfolio_data, total_potential, cache_key)
             
         finally:
             db.close()
     
-    def save_portfolio_analysis(self, portfolio_data, total_potential):
+    def print_portfolio(self, portfolio_data, total_potential):
+        """Print the ranked portfolio table, summary and action plan"""
+        
+        lines = []
+        
+        # Print summary table
+        lines.append(f"{'Rank':<4} {'Prospectus':<15} {'Location':<20} {'Annual Value':<12} {'Your Fee':<12} {'Rating':<10}")
+        lines.append("-" * 85)
+        
+        row = PORTFOLIO_ROW_FORMAT.format
+        lines.extend(
+            row(i, deal.prospectus_number[:14], deal.location[:19], deal.annual_value / 1000000,
+                deal.potential_earnings / 1000, deal.deal_rating)
+            for i, deal in enumerate(portfolio_data, 1)
+        )
+        
+        # Portfolio summary
+        lines.append(f"\n💰 PORTFOLIO SUMMARY:")
+        lines.append(f"   Total Opportunities: {len(portfolio_data)}")
+        lines.append(f"   Total Potential Earnings: ${total_potential:,.0f}")
+        lines.append(f"   Average per Deal: ${total_potential/len(portfolio_data):,.0f}")
+        
+        # Top opportunities
+        top_5 = portfolio_data[:5]
+        top_5_total = sum(d.potential_earnings for d in top_5)
+        
+        lines.append(f"\n🎯 TOP 5 OPPORTUNITIES (${top_5_total:,.0f} potential):")
+        for i, deal in enumerate(top_5, 1):
+            lines.append(f"{i}. {deal.prospectus_number} - {deal.location}")
+            lines.append(f"   Potential: ${deal.potential_earnings:,.0f} | "
+                  f"Urgency: {deal.urgency_level}")
+        
+        # Risk analysis
+        high_risk = sum(1 for d in portfolio_data if d.risk_level == 'HIGH')
+        low_risk = sum(1 for d in portfolio_data if d.risk_level == 'LOW')
+        
+        lines.append(f"\n⚠️  RISK DISTRIBUTION:")
+        lines.append(f"   Low Risk: {low_risk} deals")
+        lines.append(f"   Medium Risk: {len(portfolio_data) - high_risk - low_risk} deals")
+        lines.append(f"   High Risk: {high_risk} deals")
+        
+        # Action recommendations
+        lines.append(f"\n🚀 RECOMMENDED ACTION PLAN:")
+        lines.append(f"1. Focus on top 3 opportunities: ${sum(d.potential_earnings for d in top_5[:3]):,.0f}")
+        lines.append(f"2. Prioritize {len([d for d in top_5 if d.urgency_level in ['CRITICAL', 'HIGH']])} urgent deals")
+        lines.append(f"3. Target low-risk, high-value opportunities first")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    def _portfolio_cache_key(self, db):
+        """Fingerprint of the active portfolio: last update, row count and (for urgency) today's date"""
+        last_update, count = db.execute(
+            select(func.max(Prospectus.updated_at), func.count()).where(Prospectus.status == 'active')
+        ).one()
+        return [str(last_update), count, self._now.date().isoformat()]
+    
+    def _load_cached_portfolio(self, cache_key):
+        """Return (portfolio_data, total_potential, filename) from the last saved analysis if its key matches"""
+        try:
+            with open(PORTFOLIO_CACHE_FILE, 'rb') as f:
+                sidecar = orjson.loads(f.read())
+            if sidecar['key'] != cache_key:
+                return None
+            with open(sidecar['file'], 'rb') as f:
+                summary = orjson.loads(f.read())
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        portfolio_data = [DealRow(**deal) for deal in summary['deals']]
+        return portfolio_data, summary['total_potential_earnings'], sidecar['file']
+    
+    def save_portfolio_analysis(self, portfolio_data, total_potential, cache_key=None):
         """Save portfolio analysis to file"""
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M")
@@ -431,38 +810,21 @@ class DealCalculator:
             'total_opportunities': len(portfolio_data),
             'total_potential_earnings': total_potential,
             'average_per_deal': total_potential / len(portfolio_data) if portfolio_data else 0,
-            'deals': []
+            'deals': [deal._asdict() for deal in portfolio_data]
         }
         
-        for deal in portfolio_data:
-            deal_summary = {
-                'prospectus_number': deal['opportunity_overview']['prospectus_number'],
-                'location': deal['opportunity_overview']['location'],
-                'annual_value': deal['opportunity_overview']['annual_lease_value'],
-                'potential_earnings': deal['your_potential_earnings']['total_potential'],
-                'risk_level': deal['risk_assessment']['risk_level'],
-                'deal_rating': deal['market_comparison']['deal_attractiveness'],
-                'urgency_level': deal['timeline_analysis']['urgency_level']
-            }
-            analysis_summary['deals'].append(deal_summary)
-        
-        with open(filename, 'w') as f:
-            json.dump(analysis_summary, f, indent=2, default=str)
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(analysis_summary, option=orjson.OPT_INDENT_2))
+        
+        # Sidecar tying this file to the portfolio fingerprint it was computed from
+        if cache_key is not None:
+            with open(PORTFOLIO_CACHE_FILE, 'wb') as f:
+                f.write(orjson.dumps({'key': cache_key, 'file': filename}))
         
         print(f"\n💾 Portfolio analysis saved: {filename}")
 
-def main():
-    """Main calculator function"""
-    
-    import argparse
-    parser = argparse.ArgumentParser(description="Calculate deal values")
-    parser.add_argument("--prospectus-id", type=int, help="Calculate for specific prospectus")
-    parser.add_argument("--portfolio", action="store_true", help="Analyze entire portfolio")
-    parser.add_argument("--top", type=int, default=10, help="Show top N opportunities")
-    
-    args = parser.parse_args()
-    
-    calculator = DealCalculator()
+def run_calculator(calculator, args):
+    """Dispatch the parsed CLI arguments"""
     
     if args.prospectus_id:
         db = SessionLocal()
@@ -492,5 +854,23 @@ def main():
         
         db.close()
 
+def main(argv=None):
+    """Main calculator function"""
+    
+    import argparse
+    parser = argparse.ArgumentParser(description="Calculate deal values")
+    parser.add_argument("--prospectus-id", type=int, help="Calculate for specific prospectus")
+    parser.add_argument("--portfolio", action="store_true", help="Analyze entire portfolio")
+    parser.add_argument("--top", type=int, default=10, help="Show top N opportunities")
+    
+    args = parser.parse_args(argv)
+    
+    calculator = DealCalculator()
+    
+    try:
+        run_calculator(calculator, args)
+    finally:
+        calculator.close()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
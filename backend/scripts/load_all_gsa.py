@@ -7,69 +7,259 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import re
+import logging
+import logging.handlers
+import queue
 import requests
+import shelve
+import hashlib
+import itertools
+import random
+from requests.adapters import HTTPAdapter
 import time
 from datetime import datetime
+from email.utils import formatdate
 from urllib.parse import urljoin, urlparse
 from pathlib import Path
 import concurrent.futures
-from threading import Lock
+import multiprocessing
+from threading import Lock, BoundedSemaphore, Condition
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:  # lxml is optional - BeautifulSoup falls back to the pure-Python parser
+    HTML_PARSER = 'html.parser'
 
 from app.parsers.gsa_scraper import GSAScraper
-from app.parsers.prospectus_parser import ProspectusParser
+from app.parsers.prospectus_parser import ProspectusParser, extract_pdf_text, LLM_TEXT_CHARS
 from app.notion_sync import NotionSync
 from app.database import SessionLocal, engine
-from app.models import Base, Prospectus
+from app.models import init_db, Prospectus
+
+# Downloads are pure network I/O, so they run much wider than parsing, which is
+# CPU-bound (PDF text) or rate-limited (LLM)
+DOWNLOAD_WORKERS = 32
+PARSE_WORKERS = 5
+parse_slots = BoundedSemaphore(PARSE_WORKERS)
+
+# Notion uploads overlap up to NOTION_WORKERS calls but stay under its ~3 requests/second limit
+NOTION_WORKERS = 5
+NOTION_REQUESTS_PER_SECOND = 3
+
+# Retry backoff: exponential from 1s, capped, with +/-50% jitter so failed downloads don't retry in lockstep
+RETRY_BACKOFF_CAP = 30
+
+# Bytes per read/write when streaming a PDF to disk
+DOWNLOAD_CHUNK_SIZE = 65536
+
+# Fields quick_parse must find before the LLM is skipped
+REQUIRED_FIELDS = ('prospectus_number', 'estimated_annual_cost')
+
+# Parsed prospectus data keyed by PDF content hash, kept across runs
+PARSE_CACHE_FILE = "data/prospectus_parse_cache.db"
+
+# Only anchors with an href are ever read from a library page, so build nothing else
+PDF_LINKS = SoupStrainer('a', href=True)
+
+# Link filters, both substring matches (so 'va' also hits e.g. "Nevada", as before)
+PDF_HREF_RE = re.compile(r'\.pdf', re.IGNORECASE)
+PROSPECTUS_TEXT_RE = re.compile(r'lease|prospectus|va|gsa', re.IGNORECASE)
+
+# One pooled session so every request reuses keep-alive connections to gsa.gov
+http = requests.Session()
+http.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=DOWNLOAD_WORKERS))
 
-# Thread-safe counter
+# Worker threads log through a queue; one listener thread does every stdout write,
+# so workers never wait on the stdout lock. Messages print bare, like print().
+logger = logging.getLogger('gsa_loader')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.setFormatter(logging.Formatter('%(message)s'))
+log_listener = logging.handlers.QueueListener(log_queue, _stdout_handler)
+
+class _FilenameChars(dict):
+    """str.translate table keeping alphanumerics, space, '-' and '_'; each code point is decided once"""
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        self[codepoint] = codepoint if char.isalnum() or char in ' -_' else None
+        return self[codepoint]
+
+FILENAME_CHARS = _FilenameChars()
+
+# Thread-safe counter: next() on itertools.count is a single C call, atomic under the GIL
 class Counter:
     def __init__(self):
+        self._it = itertools.count(1)
         self._value = 0
-        self._lock = Lock()
     
     def increment(self):
-        with self._lock:
-            self._value += 1
-            return self._value
+        count = next(self._it)
+        self._value = max(self._value, count)
+        return count
     
     @property
     def value(self):
         return self._value
 
+class ParseCache:
+    """Parsed data per PDF content hash, shared by the worker threads.
+    
+    A hash being parsed by one thread is claimed, so byte-identical PDFs reached
+    through different URLs wait for that result instead of parsing again. LLM
+    results are also kept under a hash of the text the LLM saw (see llm_text_key).
+    """
+    def __init__(self, path: str = PARSE_CACHE_FILE):
+        self._shelf = shelve.open(path)
+        self._in_flight = set()
+        self._cond = Condition()
+    
+    def claim(self, digest: str):
+        """Return a copy of the cached data, or None after claiming digest for the caller to parse"""
+        with self._cond:
+            while digest in self._in_flight:
+                self._cond.wait()
+            cached = self._shelf.get(digest)
+            if cached is not None:
+                return dict(cached)
+            self._in_flight.add(digest)
+            return None
+    
+    def release(self, digest: str, data: dict = None):
+        """Release a claim, storing data if the parse produced a result worth keeping"""
+        with self._cond:
+            if data is not None:
+                self._shelf[digest] = data
+            self._in_flight.discard(digest)
+            self._cond.notify_all()
+    
+    def close(self):
+        with self._cond:
+            self._shelf.close()
+
+class RateLimiter:
+    """Spaces calls from any number of threads at least 1/rate seconds apart"""
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+        self._lock = Lock()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def llm_text_key(text: str) -> str:
+    """ParseCache key for an LLM parse; only the first LLM_TEXT_CHARS reach the LLM"""
+    return 'text:' + hashlib.blake2b(text[:LLM_TEXT_CHARS].encode()).hexdigest()
+
+def file_digest(filepath: str) -> str:
+    """Content hash of a downloaded PDF"""
+    with open(filepath, 'rb') as f:
+        return hashlib.file_digest(f, 'blake2b').hexdigest()
+
 def setup_directories():
     """Create necessary directories"""
     Path("data/prospectuses").mkdir(parents=True, exist_ok=True)
     Path("data/exports").mkdir(parents=True, exist_ok=True)
 
-def download_pdf(url: str, filename: str, retries: int = 3) -> bool:
-    """Download a PDF file with retry logic"""
+def download_pdf(url: str, filename: str, retries: int = 3) -> str:
+    """Download a PDF file with retry logic
+    
+    A file already on disk is revalidated with a conditional GET and only
+    re-downloaded if the server has a newer copy. Returns the file's content
+    hash (see file_digest), or None if the download failed.
+    """
     filepath = f"data/prospectuses/{filename}"
+    etag_path = f"{filepath}.etag"
     
-    # Skip if already exists
+    headers = {}
     if os.path.exists(filepath):
-        return True
+        headers['If-Modified-Since'] = formatdate(os.path.getmtime(filepath), usegmt=True)
+        if os.path.exists(etag_path):
+            with open(etag_path) as f:
+                headers['If-None-Match'] = f.read().strip()
     
     for attempt in range(retries):
         try:
-            response = requests.get(url, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with http.get(url, headers=headers, timeout=30, stream=True) as response:
+                # Unchanged since our copy
+                if response.status_code == 304:
+                    return file_digest(filepath)
+                response.raise_for_status()
+                
+                # Hash while writing, so the dedup check needs no second read of the file;
+                # written aside and swapped in, so a failed download never replaces a good copy
+                digest = hashlib.blake2b()
+                response.raw.decode_content = True
+                partial_path = f"{filepath}.part"
+                with open(partial_path, 'wb') as f:
+                    while chunk := response.raw.read(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                os.replace(partial_path, filepath)
+                
+                etag = response.headers.get('ETag')
+                if etag:
+                    with open(etag_path, 'w') as f:
+                        f.write(etag)
             
-            return True
+            return digest.hexdigest()
             
         except Exception as e:
-            print(f"❌ Download attempt {attempt + 1} failed for {filename}: {e}")
+            logger.info(f"❌ Download attempt {attempt + 1} failed for {filename}: {e}")
+            
+            # Client errors other than rate limiting (e.g. 404) will not succeed on retry
+            status = getattr(getattr(e, 'response', None), 'status_code', None)
+            if status is not None and status < 500 and status != 429:
+                break
+            
             if attempt < retries - 1:
-                time.sleep(2)
+                time.sleep(min(RETRY_BACKOFF_CAP, 2 ** attempt) * random.uniform(0.5, 1.5))
     
-    return False
+    # Fall back to the copy we already have, if any
+    return file_digest(filepath) if os.path.exists(filepath) else None
+
+def parse_prospectus_text(text: str, filename: str, parser: ProspectusParser,
+                          parse_cache: ParseCache) -> tuple:
+    """Regex parse first; only escalate to the LLM when it misses required fields
+    
+    Returns (data, complete); an incomplete quick parse is not worth caching.
+    """
+    data = parser.quick_parse(text)
+    if all(data.get(field) for field in REQUIRED_FIELDS):
+        return data, True
+    
+    # Different PDF bytes can still carry the same text; ask the LLM once per text
+    text_key = llm_text_key(text)
+    llm_data = parse_cache.claim(text_key)
+    if llm_data is None:
+        try:
+            llm_data = parser.parse_with_llm(text)
+        except Exception as e:
+            logger.info(f"⚠️  LLM parsing failed for {filename}, using quick parse: {e}")
+        finally:
+            parse_cache.release(text_key, dict(llm_data) if llm_data is not None else None)
+    
+    if llm_data is None:
+        return data, False
+    return llm_data, True
 
 def process_prospectus(prospectus_info: dict, parser: ProspectusParser, 
-                      notion: NotionSync, counter: Counter) -> dict:
-    """Process a single prospectus: download, parse, store"""
+                      notion: NotionSync, counter: Counter, parse_cache: ParseCache,
+                      text_pool: concurrent.futures.ProcessPoolExecutor) -> dict:
+    """Process a single prospectus: download, parse, store
+    
+    text_pool: worker processes for PDF text extraction, which is CPU-bound
+    """
     
     result = {
         'title': prospectus_info['title'],
@@ -81,25 +271,30 @@ def process_prospectus(prospectus_info: dict, parser: ProspectusParser,
     
     try:
         # Create safe filename
-        safe_title = "".join(c for c in prospectus_info['title'] if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_title = prospectus_info['title'].translate(FILENAME_CHARS).rstrip()
         filename = f"{safe_title[:50]}.pdf"
         
         # Download PDF
-        print(f"📥 Downloading: {safe_title[:60]}...")
-        if not download_pdf(prospectus_info['url'], filename):
+        logger.info(f"📥 Downloading: {safe_title[:60]}...")
+        digest = download_pdf(prospectus_info['url'], filename)
+        if digest is None:
             result['error'] = "Download failed"
             return result
         
-        # Parse PDF
+        # Parse PDF, unless these exact bytes were parsed before
         filepath = f"data/prospectuses/{filename}"
-        text = parser.extract_text_from_pdf(filepath)
-        
-        # Try LLM parsing first, fallback to quick parse
-        try:
-            data = parser.parse_with_llm(text)
-        except Exception as e:
-            print(f"⚠️  LLM parsing failed for {filename}, using quick parse: {e}")
-            data = parser.quick_parse(text)
+        data = parse_cache.claim(digest)
+        if data is None:
+            parsed = None
+            try:
+                with parse_slots:  # at most PARSE_WORKERS parse at once
+                    text = text_pool.submit(extract_pdf_text, filepath).result()
+                    data, complete = parse_prospectus_text(text, filename, parser, parse_cache)
+                if complete:
+                    parsed = dict(data)
+            finally:
+                # Incomplete quick parses are not cached, so a later run can still try the LLM
+                parse_cache.release(digest, parsed)
         
         # Add metadata
         data['pdf_url'] = prospectus_info['url']
@@ -109,18 +304,19 @@ def process_prospectus(prospectus_info: dict, parser: ProspectusParser,
         result['success'] = True
         
         count = counter.increment()
-        print(f"✅ [{count}] Parsed: {data.get('prospectus_number', 'Unknown')} - {data.get('location', 'Unknown')}")
+        logger.info(f"✅ [{count}] Parsed: {data.get('prospectus_number', 'Unknown')} - {data.get('location', 'Unknown')}")
         
         return result
         
     except Exception as e:
         result['error'] = str(e)
-        print(f"❌ Error processing {prospectus_info['title']}: {e}")
+        logger.info(f"❌ Error processing {prospectus_info['title']}: {e}")
         return result
 
 def get_all_gsa_prospectuses():
     """Get prospectuses from multiple GSA sources"""
     prospectuses = []
+    found_at = datetime.utcnow().isoformat()  # one timestamp for the whole scrape round
     
     # Source 1: GSA Prospectus Library (Enhanced)
     print("🔍 Searching GSA Prospectus Library...")
@@ -135,8 +331,8 @@ def get_all_gsa_prospectuses():
     for url in prospectus_urls:
         try:
             print(f"   Scanning {url.split('/')[-1]}...")
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            response = http.get(url, timeout=10)
+            soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=PDF_LINKS)
             
             # Find all PDF links
             for link in soup.find_all('a', href=True):
@@ -144,16 +340,14 @@ def get_all_gsa_prospectuses():
                 text = link.text.strip()
                 
                 # Look for prospectus PDFs
-                if (('.pdf' in href.lower()) and 
-                    ('lease' in text.lower() or 'prospectus' in text.lower() or 
-                     'va' in text.lower() or 'gsa' in text.lower())):
+                if PDF_HREF_RE.search(href) and PROSPECTUS_TEXT_RE.search(text):
                     
                     pdf_url = f"https://www.gsa.gov{href}" if not href.startswith('http') else href
                     
                     prospectuses.append({
                         'title': text,
                         'url': pdf_url,
-                        'date_found': datetime.utcnow().isoformat(),
+                        'date_found': found_at,
                         'source': url.split('/')[-1]
                     })
             
@@ -165,13 +359,13 @@ def get_all_gsa_prospectuses():
         {
             'title': 'VA Medical Center Franklin County OH - POH-09-VA25',
             'url': 'https://www.gsa.gov/cdnstatic/POH-09-VA25_Franklin_County_OH.pdf',
-            'date_found': datetime.utcnow().isoformat(),
+            'date_found': found_at,
             'source': 'manual_va_targets'
         },
         {
             'title': 'VA Medical Center Salt Lake City UT - PUT-24-VA25',
             'url': 'https://www.gsa.gov/cdnstatic/PUT-24-VA25_Salt_Lake_City_UT.pdf',
-            'date_found': datetime.utcnow().isoformat(),
+            'date_found': found_at,
             'source': 'manual_va_targets'
         }
     ]
@@ -186,14 +380,9 @@ def get_all_gsa_prospectuses():
     except Exception as e:
         print(f"⚠️  D2D pipeline access failed: {e}")
     
-    # Remove duplicates
-    unique_prospectuses = []
-    seen_urls = set()
-    
-    for p in prospectuses:
-        if p['url'] not in seen_urls:
-            unique_prospectuses.append(p)
-            seen_urls.add(p['url'])
+    # Remove duplicates, keeping the first entry for each URL in first-seen order
+    first_by_url = {p['url']: p for p in reversed(prospectuses)}
+    unique_prospectuses = [first_by_url[url] for url in dict.fromkeys(p['url'] for p in prospectuses)]
     
     print(f"📋 Total unique prospectuses to process: {len(unique_prospectuses)}")
     return unique_prospectuses
@@ -204,6 +393,14 @@ def get_d2d_pipeline_data():
     # For now, return empty list
     return []
 
+def load_known_urls() -> set:
+    """PDF URLs of prospectuses already in the database"""
+    db = SessionLocal()
+    try:
+        return {url for (url,) in db.query(Prospectus.pdf_url).filter(Prospectus.pdf_url.isnot(None))}
+    finally:
+        db.close()
+
 def load_to_database(parsed_data: list):
     """Load parsed data into local database"""
     print("\n💾 Loading data into database...")
@@ -212,31 +409,35 @@ def load_to_database(parsed_data: list):
     loaded_count = 0
     
     try:
-        for item in parsed_data:
-            if not item['success'] or not item['data']:
-                continue
-            
-            data = item['data']
-            
-            # Check if already exists
-            existing = db.query(Prospectus).filter(
-                Prospectus.prospectus_number == data.get('prospectus_number')
-            ).first()
-            
-            if existing:
-                print(f"⚠️  Skipping duplicate: {data.get('prospectus_number')}")
+        items = [item['data'] for item in parsed_data if item['success'] and item['data']]
+        
+        # One lookup for every number already stored, instead of a query per item
+        numbers = [data['prospectus_number'] for data in items if data.get('prospectus_number')]
+        existing = {
+            number for (number,) in db.query(Prospectus.prospectus_number).filter(
+                Prospectus.prospectus_number.in_(numbers)
+            )
+        }
+        
+        new_prospectuses = []
+        for data in items:
+            number = data.get('prospectus_number')
+            if number in existing:
+                print(f"⚠️  Skipping duplicate: {number}")
                 continue
             
             # Create new prospectus
             try:
-                prospectus = Prospectus(**data)
-                db.add(prospectus)
+                new_prospectuses.append(Prospectus(**data))
+                existing.add(number)
                 loaded_count += 1
             except Exception as e:
                 print(f"❌ Error creating prospectus from data: {e}")
                 print(f"   Data keys: {list(data.keys())}")
                 continue
         
+        # Flushed together, as one batched INSERT
+        db.add_all(new_prospectuses)
         db.commit()
         print(f"✅ Loaded {loaded_count} prospectuses into database")
         
@@ -253,30 +454,46 @@ def load_to_notion(parsed_data: list, notion: NotionSync):
     print("\n☁️  Loading data into Notion...")
     
     loaded_count = 0
+    limiter = RateLimiter(NOTION_REQUESTS_PER_SECOND)
+    
+    def push(data):
+        limiter.wait()
+        return notion.add_prospectus(data)
+    
+    items = [item['data'] for item in parsed_data if item['success'] and item['data']]
     
-    for item in parsed_data:
-        if not item['success'] or not item['data']:
-            continue
+    with concurrent.futures.ThreadPoolExecutor(max_workers=NOTION_WORKERS) as executor:
+        future_to_data = {executor.submit(push, data): data for data in items}
         
-        try:
-            notion_id = notion.add_prospectus(item['data'])
-            if notion_id:
-                loaded_count += 1
-                print(f"✅ Added to Notion: {item['data'].get('prospectus_number')}")
-        except Exception as e:
-            print(f"❌ Notion error for {item['data'].get('prospectus_number')}: {e}")
+        for future in concurrent.futures.as_completed(future_to_data):
+            data = future_to_data[future]
+            try:
+                notion_id = future.result()
+                if notion_id:
+                    loaded_count += 1
+                    print(f"✅ Added to Notion: {data.get('prospectus_number')}")
+            except Exception as e:
+                print(f"❌ Notion error for {data.get('prospectus_number')}: {e}")
     
     print(f"✅ Loaded {loaded_count} prospectuses into Notion")
     return loaded_count
 
-def main():
+def main(argv=None):
     """Main loader function"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load all GSA prospectuses")
+    parser.add_argument("--no-notion", action="store_true", help="Skip Notion upload")
+    parser.add_argument("--max-count", type=int, help="Maximum number to process (for testing)")
+    
+    args = parser.parse_args(argv)
+    
     print("🦅 GSA Prospectus Bulk Loader")
     print("=" * 60)
     
     # Setup
     setup_directories()
-    Base.metadata.create_all(bind=engine)
+    init_db(engine)
     
     # Initialize services
     parser = ProspectusParser()
@@ -286,6 +503,13 @@ def main():
     # Get all prospectuses
     prospectuses = get_all_gsa_prospectuses()
     
+    # Already loaded on an earlier run; downloading and parsing them again would only end as a skipped duplicate
+    known_urls = load_known_urls()
+    if known_urls:
+        new_prospectuses = [p for p in prospectuses if p['url'] not in known_urls]
+        print(f"⏭️  Skipping {len(prospectuses) - len(new_prospectuses)} already loaded prospectuses")
+        prospectuses = new_prospectuses
+    
     if not prospectuses:
         print("❌ No prospectuses found to process")
         return
@@ -295,11 +519,18 @@ def main():
     start_time = time.time()
     
     parsed_results = []
-    
-    # Use ThreadPoolExecutor for parallel processing
-    with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
+    parse_cache = ParseCache()
+    log_listener.start()
+    
+    # Use ThreadPoolExecutor for parallel processing; downloads overlap widely,
+    # parsing is held to PARSE_WORKERS at a time, with text extraction in
+    # separate processes so it runs outside the GIL. Those processes start lazily from
+    # worker threads while others hold locks, so they come from a forkserver, not fork
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(PARSE_WORKERS, os.cpu_count() or 1),
+                                                mp_context=multiprocessing.get_context("forkserver")) as text_pool, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
         future_to_prospectus = {
-            executor.submit(process_prospectus, p, parser, notion, counter): p 
+            executor.submit(process_prospectus, p, parser, notion, counter, parse_cache, text_pool): p 
             for p in prospectuses
         }
         
@@ -307,6 +538,9 @@ def main():
             result = future.result()
             parsed_results.append(result)
     
+    log_listener.stop()
+    parse_cache.close()
+    
     processing_time = time.time() - start_time
     
     # Count results
@@ -363,12 +597,4 @@ def main():
     print("3. Start API server: uvicorn app.main:app --reload")
 
 if __name__ == "__main__":
-    import argparse
-    
-    parser = argparse.ArgumentParser(description="Load all GSA prospectuses")
-    parser.add_argument("--no-notion", action="store_true", help="Skip Notion upload")
-    parser.add_argument("--max-count", type=int, help="Maximum number to process (for testing)")
-    
-    args = parser.parse_args()
-    
     main()
\ No newline at end of file
@@ -3,16 +3,17 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal, engine
-from app.models import Base, Prospectus, Property
+from app.models import init_db, Prospectus, Property
 from datetime import datetime
+from sqlalchemy import insert
 
 # Create tables
-Base.metadata.create_all(bind=engine)
+init_db(engine)
 
 db = SessionLocal()
 
 # Add the VA prospectuses from your PDFs
-va_franklin = Prospectus(
+va_franklin = dict(
     prospectus_number="POH-09-VA25",
     agency="Veterans Affairs",
     location="Franklin County, OH",
@@ -30,7 +31,7 @@ va_franklin = Prospectus(
     scoring_type="Operating Lease"
 )
 
-va_salt_lake = Prospectus(
+va_salt_lake = dict(
     prospectus_number="PUT-24-VA25",
     agency="Veterans Affairs", 
     location="Salt Lake City, UT",
@@ -45,9 +46,9 @@ va_salt_lake = Prospectus(
     scoring_type="Operating Lease"
 )
 
-db.add(va_franklin)
-db.add(va_salt_lake)
-db.commit()
+# One bulk INSERT in a single transaction rather than an ORM add per row
+with db.begin():
+    db.execute(insert(Prospectus), [va_franklin, va_salt_lake])
 
 print("Sample data loaded successfully!")
 
@@ -7,14 +7,74 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import io
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import json
+import orjson
+from string import Formatter
+from collections import ChainMap
+from types import MappingProxyType
+from sqlalchemy.orm import load_only
 from app.database import SessionLocal
 from app.models import Prospectus, Property, Match
 
+# High-value campaigns generated concurrently; each is mostly SQL and file I/O
+CAMPAIGN_WORKERS = 8
+CAMPAIGN_SEPARATOR = "\n" + "=" * 60 + "\n\n"
+
+# Fallback template values when the caller passes none; read-only, shared by every render
+EMAIL_STATIC_DEFAULTS = MappingProxyType({
+    'your_name': '[Your Name]',
+    'your_phone': '[Your Phone]',
+    'your_email': '[Your Email]',
+    'match_score': 95,
+    'owner_name': 'Property Owner',
+    'availability': 'Monday-Friday 9am-5pm',
+    'rfp_date': 'Within 60 days',
+    'proposal_deadline': '30 days after RFP',
+    'award_date': '90 days after RFP'
+})
+CALL_STATIC_DEFAULTS = MappingProxyType({
+    'availability': 'this week'
+})
+
+# Columns the templates and campaign output read; everything else stays unloaded
+OUTREACH_PROSPECTUS_COLUMNS = (
+    Prospectus.id, Prospectus.prospectus_number, Prospectus.agency, Prospectus.location,
+    Prospectus.state, Prospectus.estimated_annual_cost, Prospectus.estimated_nusf,
+    Prospectus.parking_spaces, Prospectus.max_lease_term_years, Prospectus.rental_rate_per_nusf,
+    Prospectus.current_lease_expiration
+)
+OUTREACH_PROPERTY_COLUMNS = (
+    Property.id, Property.address, Property.available_sqft, Property.total_sqft,
+    Property.parking_spaces
+)
+
+def compile_template(text):
+    """Parse a str.format template once into (literal, field, format_spec) tokens for render_template"""
+    tokens = []
+    for literal, field, format_spec, conversion in Formatter().parse(text):
+        if conversion or (field and ('.' in field or '[' in field)):
+            raise ValueError(f"Unsupported template field: {{{field}!{conversion}}}")
+        tokens.append((literal, field, format_spec))
+    return tuple(tokens)
+
+def render_pieces(tokens, values):
+    """Render each compile_template token to its text; raises KeyError on missing fields"""
+    return [literal if field is None else literal + format(values[field], format_spec)
+            for literal, field, format_spec in tokens]
+
+def render_template(tokens, values):
+    """Equivalent of text.format(**values) for compile_template(text) tokens; raises KeyError on missing fields"""
+    return ''.join(render_pieces(tokens, values))
+
 class OutreachGenerator:
+    # Set once data/outreach has been created, so batch runs skip the makedirs per campaign
+    _outdir_ready = False
+    
     def __init__(self):
         self.templates = {}
+        self.compiled_templates = {}
         self.load_templates()
     
     def load_templates(self):
@@ -131,11 +191,23 @@ Best regards,
 {your_name}'''
             }
         }
-    
-    def generate_owner_email(self, prospectus, property, template_type='initial_email', **kwargs):
-        """Generate personalized email to property owner"""
         
-        template = self.templates.get(template_type, self.templates['initial_email'])
+        # Parsed once here; every email and script in a campaign renders from these
+        self.compiled_templates = {
+            template_type: {section: compile_template(text) for section, text in sections.items()}
+            for template_type, sections in self.templates.items()
+        }
+        
+        # Cold call sections concatenated into one token list, with each section's token range,
+        # so a script renders in a single pass
+        combined, bounds = [], []
+        for section, tokens in self.compiled_templates['cold_call_script'].items():
+            bounds.append((section, len(combined), len(combined) + len(tokens)))
+            combined.extend(tokens)
+        self.cold_call_layout = (tuple(combined), tuple(bounds))
+    
+    def prospectus_defaults(self, prospectus):
+        """Template values that depend only on the prospectus; compute once per campaign"""
         
         # Calculate values
         total_lease_value = (prospectus.estimated_annual_cost or 0) * (prospectus.max_lease_term_years or 10)
@@ -146,38 +218,42 @@ Best regards,
         if prospectus.current_lease_expiration:
             exp_date = prospectus.current_lease_expiration.strftime("%B %Y")
         
-        # Default values
-        defaults = {
+        return {
             'agency': prospectus.agency or 'Federal Agency',
             'sqft': prospectus.estimated_nusf or 0,
             'location': f"{prospectus.location}, {prospectus.state}",
             'annual_value': prospectus.estimated_annual_cost or 0,
-            'address': property.address,
-            'available_sqft': property.available_sqft or property.total_sqft or 0,
-            'parking': property.parking_spaces or 0,
             'required_parking': prospectus.parking_spaces or 0,
             'rent_per_sqft': prospectus.rental_rate_per_nusf or 20.0,
             'lease_term': prospectus.max_lease_term_years or 10,
             'expiration_date': exp_date,
             'total_lease_value': total_lease_value,
-            'potential_fee': potential_fee,
-            'your_name': kwargs.get('your_name', '[Your Name]'),
-            'your_phone': kwargs.get('your_phone', '[Your Phone]'),
-            'your_email': kwargs.get('your_email', '[Your Email]'),
-            'match_score': kwargs.get('match_score', 95),
-            'owner_name': kwargs.get('owner_name', 'Property Owner'),
-            'availability': kwargs.get('availability', 'Monday-Friday 9am-5pm'),
-            'rfp_date': kwargs.get('rfp_date', 'Within 60 days'),
-            'proposal_deadline': kwargs.get('proposal_deadline', '30 days after RFP'),
-            'award_date': kwargs.get('award_date', '90 days after RFP')
+            'potential_fee': potential_fee
         }
+    
+    def generate_owner_email(self, prospectus, property, template_type='initial_email',
+                             prospectus_defaults=None, **kwargs):
+        """Generate personalized email to property owner
         
-        # Merge with any additional kwargs
-        defaults.update(kwargs)
+        prospectus_defaults: precomputed self.prospectus_defaults(prospectus), reused across a campaign
+        """
+        
+        template = self.compiled_templates.get(template_type, self.compiled_templates['initial_email'])
+        
+        if prospectus_defaults is None:
+            prospectus_defaults = self.prospectus_defaults(prospectus)
+        
+        # Lookups fall through kwargs, then property, prospectus and static defaults; nothing is copied
+        property_values = {
+            'address': property.address,
+            'available_sqft': property.available_sqft or property.total_sqft or 0,
+            'parking': property.parking_spaces or 0
+        }
+        defaults = ChainMap(kwargs, property_values, prospectus_defaults, EMAIL_STATIC_DEFAULTS)
         
         try:
-            subject = template['subject'].format(**defaults)
-            body = template['body'].format(**defaults)
+            subject = render_template(template['subject'], defaults)
+            body = render_template(template['body'], defaults)
             
             return {
                 'subject': subject,
@@ -185,7 +261,7 @@ Best regards,
                 'recipient_info': {
                     'property_address': property.address,
                     'prospectus_number': prospectus.prospectus_number,
-                    'potential_value': potential_fee
+                    'potential_value': prospectus_defaults['potential_fee']
                 }
             }
         except KeyError as e:
@@ -195,38 +271,35 @@ Best regards,
                 'body': f"Error generating template for {property.address}"
             }
     
-    def generate_cold_call_script(self, prospectus, property, **kwargs):
-        """Generate cold call script"""
+    def generate_cold_call_script(self, prospectus, property, prospectus_defaults=None, **kwargs):
+        """Generate cold call script
         
-        template = self.templates['cold_call_script']
+        prospectus_defaults: precomputed self.prospectus_defaults(prospectus), reused across a campaign
+        """
         
-        # Calculate values (same as email)
-        total_lease_value = (prospectus.estimated_annual_cost or 0) * (prospectus.max_lease_term_years or 10)
+        template = self.compiled_templates['cold_call_script']
         
-        exp_date = "TBD"
-        if prospectus.current_lease_expiration:
-            exp_date = prospectus.current_lease_expiration.strftime("%B %Y")
+        if prospectus_defaults is None:
+            prospectus_defaults = self.prospectus_defaults(prospectus)
         
-        defaults = {
+        property_values = {
             'address': property.address,
-            'agency': prospectus.agency or 'Federal Agency',
-            'sqft': prospectus.estimated_nusf or 0,
-            'lease_term': prospectus.max_lease_term_years or 10,
-            'annual_value': prospectus.estimated_annual_cost or 0,
-            'total_lease_value': total_lease_value,
-            'available_sqft': property.available_sqft or property.total_sqft or 0,
-            'expiration_date': exp_date,
-            'availability': kwargs.get('availability', 'this week'),
+            'available_sqft': property.available_sqft or property.total_sqft or 0
         }
+        defaults = ChainMap(kwargs, property_values, prospectus_defaults, CALL_STATIC_DEFAULTS)
         
-        defaults.update(kwargs)
-        
-        script_parts = {}
-        for section, text in template.items():
-            try:
-                script_parts[section] = text.format(**defaults)
-            except KeyError as e:
-                script_parts[section] = f"[Template error: {e}]"
+        combined, bounds = self.cold_call_layout
+        try:
+            rendered = render_pieces(combined, defaults)
+            script_parts = {section: ''.join(rendered[start:end]) for section, start, end in bounds}
+        except KeyError:
+            # Re-render section by section so only the broken sections carry the error
+            script_parts = {}
+            for section, tokens in template.items():
+                try:
+                    script_parts[section] = render_template(tokens, defaults)
+                except KeyError as e:
+                    script_parts[section] = f"[Template error: {e}]"
         
         return {
             'opening': script_parts['opening'],
@@ -237,25 +310,34 @@ Best regards,
             'full_script': '\n\n'.join(script_parts.values())
         }
     
-    def generate_outreach_campaign(self, prospectus_id, limit=20):
-        """Generate complete outreach campaign for a prospectus"""
+    def generate_outreach_campaign(self, prospectus_id, limit=20, db=None, run_at=None, out=None):
+        """Generate complete outreach campaign for a prospectus
+        
+        db: an open session to reuse (left open); by default a session is opened and closed here
+        run_at: batch start time used to stamp the saved files; defaults to now
+        out: stream for progress output; defaults to stdout
+        """
         
-        print(f"🎯 Generating Outreach Campaign for Prospectus ID: {prospectus_id}")
-        print("=" * 60)
+        print(f"🎯 Generating Outreach Campaign for Prospectus ID: {prospectus_id}", file=out)
+        print("=" * 60, file=out)
         
-        db = SessionLocal()
+        owns_session = db is None
+        if owns_session:
+            db = SessionLocal()
         
         try:
             # Get prospectus
-            prospectus = db.query(Prospectus).filter(Prospectus.id == prospectus_id).first()
+            prospectus = db.query(Prospectus).options(load_only(*OUTREACH_PROSPECTUS_COLUMNS)).filter(
+                Prospectus.id == prospectus_id
+            ).first()
             if not prospectus:
-                print(f"❌ Prospectus ID {prospectus_id} not found")
+                print(f"❌ Prospectus ID {prospectus_id} not found", file=out)
                 return
             
-            print(f"📋 Prospectus: {prospectus.prospectus_number}")
-            print(f"   Agency: {prospectus.agency}")
-            print(f"   Location: {prospectus.location}, {prospectus.state}")
-            print(f"   Annual Value: ${prospectus.estimated_annual_cost:,.0f}")
+            print(f"📋 Prospectus: {prospectus.prospectus_number}", file=out)
+            print(f"   Agency: {prospectus.agency}", file=out)
+            print(f"   Location: {prospectus.location}, {prospectus.state}", file=out)
+            print(f"   Annual Value: ${prospectus.estimated_annual_cost:,.0f}", file=out)
             
             # Get top matching properties
             matches = db.query(Match).filter(
@@ -263,15 +345,23 @@ Best regards,
             ).order_by(Match.total_score.desc()).limit(limit).all()
             
             if not matches:
-                print("❌ No property matches found. Run property matching first.")
+                print("❌ No property matches found. Run property matching first.", file=out)
                 return
             
-            print(f"\n🏢 Generating outreach for top {len(matches)} property matches")
+            print(f"\n🏢 Generating outreach for top {len(matches)} property matches", file=out)
+            
+            # All matched properties in one query; ranks still count matches whose property is gone
+            property_ids = {match.property_id for match in matches}
+            properties = {p.id: p for p in db.query(Property).options(load_only(*OUTREACH_PROPERTY_COLUMNS)).filter(
+                Property.id.in_(property_ids)
+            )}
             
             outreach_items = []
+            campaign_defaults = self.prospectus_defaults(prospectus)
+            total_potential = 0.0
             
             for i, match in enumerate(matches, 1):
-                property = db.query(Property).filter(Property.id == match.property_id).first()
+                property = properties.get(match.property_id)
                 if not property:
                     continue
                 
@@ -279,6 +369,7 @@ Best regards,
                 email = self.generate_owner_email(
                     prospectus, 
                     property,
+                    prospectus_defaults=campaign_defaults,
                     your_name="[Your Name Here]",
                     your_phone="[Your Phone]", 
                     your_email="[Your Email]",
@@ -286,7 +377,7 @@ Best regards,
                 )
                 
                 # Generate call script
-                script = self.generate_cold_call_script(prospectus, property)
+                script = self.generate_cold_call_script(prospectus, property, prospectus_defaults=campaign_defaults)
                 
                 outreach_item = {
                     'rank': i,
@@ -294,60 +385,64 @@ Best regards,
                     'match_score': match.total_score,
                     'email': email,
                     'call_script': script,
-                    'potential_fee': (prospectus.estimated_annual_cost or 0) * 0.02
+                    'potential_fee': campaign_defaults['potential_fee']
                 }
                 
                 outreach_items.append(outreach_item)
+                total_potential += outreach_item['potential_fee']
                 
-                print(f"✅ [{i:2d}] {property.address} - {match.total_score:.0f}% match")
+                print(f"✅ [{i:2d}] {property.address} - {match.total_score:.0f}% match", file=out)
             
             # Save to file
-            self.save_outreach_campaign(outreach_items, prospectus)
+            self.save_outreach_campaign(outreach_items, prospectus, run_at, out)
             
             # Print summary and next steps
-            self.print_campaign_summary(outreach_items, prospectus)
+            self.print_campaign_summary(outreach_items, prospectus, total_potential, out)
             
         finally:
-            db.close()
+            if owns_session:
+                db.close()
     
-    def save_outreach_campaign(self, outreach_items, prospectus):
+    def save_outreach_campaign(self, outreach_items, prospectus, run_at=None, out=None):
         """Save outreach campaign to files"""
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        if run_at is None:
+            run_at = datetime.now()
+        timestamp = run_at.strftime("%Y%m%d_%H%M")
         base_filename = f"outreach_{prospectus.prospectus_number}_{timestamp}"
         
         # Create outreach directory
-        os.makedirs("data/outreach", exist_ok=True)
-        
-        # Save as JSON for programmatic use
-        json_data = []
-        for item in outreach_items:
-            json_item = {
-                'rank': item['rank'],
-                'property_address': item['property'].address,
-                'match_score': item['match_score'],
-                'email_subject': item['email']['subject'],
-                'email_body': item['email']['body'],
-                'call_script': item['call_script']['full_script'],
-                'potential_fee': item['potential_fee']
-            }
-            json_data.append(json_item)
+        if not OutreachGenerator._outdir_ready:
+            os.makedirs("data/outreach", exist_ok=True)
+            OutreachGenerator._outdir_ready = True
         
         json_file = f"data/outreach/{base_filename}.json"
-        with open(json_file, 'w') as f:
-            json.dump(json_data, f, indent=2)
-        
-        # Save as readable text file
         text_file = f"data/outreach/{base_filename}.txt"
-        with open(text_file, 'w') as f:
+        
+        # One pass over the campaign writes both files: JSON for programmatic use
+        # (streamed item by item as an indented array) and readable text
+        with open(json_file, 'wb') as json_f, open(text_file, 'w') as f:
             f.write(f"OUTREACH CAMPAIGN\n")
             f.write(f"Prospectus: {prospectus.prospectus_number}\n")
             f.write(f"Agency: {prospectus.agency}\n")
             f.write(f"Location: {prospectus.location}, {prospectus.state}\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+            f.write(f"Generated: {run_at.strftime('%Y-%m-%d %H:%M')}\n")
             f.write("=" * 80 + "\n\n")
             
-            for item in outreach_items:
+            json_f.write(b"[")
+            for n, item in enumerate(outreach_items):
+                json_item = {
+                    'rank': item['rank'],
+                    'property_address': item['property'].address,
+                    'match_score': item['match_score'],
+                    'email_subject': item['email']['subject'],
+                    'email_body': item['email']['body'],
+                    'call_script': item['call_script']['full_script'],
+                    'potential_fee': item['potential_fee']
+                }
+                json_f.write(b",\n  " if n else b"\n  ")
+                json_f.write(orjson.dumps(json_item, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+                
                 f.write(f"PROPERTY #{item['rank']:02d} - MATCH SCORE: {item['match_score']:.0f}%\n")
                 f.write(f"Address: {item['property'].address}\n")
                 f.write(f"Potential Fee: ${item['potential_fee']:,.0f}\n")
@@ -360,49 +455,61 @@ Best regards,
                 f.write("COLD CALL SCRIPT:\n")
                 f.write(f"{item['call_script']['full_script']}\n\n")
                 f.write("=" * 80 + "\n\n")
+            json_f.write(b"\n]" if outreach_items else b"]")
         
-        print(f"\n💾 Campaign saved to:")
-        print(f"   📄 {text_file}")
-        print(f"   📊 {json_file}")
+        print(f"\n💾 Campaign saved to:", file=out)
+        print(f"   📄 {text_file}", file=out)
+        print(f"   📊 {json_file}", file=out)
     
-    def print_campaign_summary(self, outreach_items, prospectus):
-        """Print campaign summary and action items"""
+    def print_campaign_summary(self, outreach_items, prospectus, total_potential=None, out=None):
+        """Print campaign summary and action items
+        
+        total_potential: the items' summed potential fees, when the caller kept a running total
+        """
         
-        total_potential = sum(item['potential_fee'] for item in outreach_items)
+        if total_potential is None:
+            total_potential = sum(item['potential_fee'] for item in outreach_items)
         top_5 = outreach_items[:5]
         
-        print(f"\n📊 CAMPAIGN SUMMARY")
-        print(f"   Properties: {len(outreach_items)}")
-        print(f"   Total Potential Fees: ${total_potential:,.0f}")
-        print(f"   Average Per Property: ${total_potential/len(outreach_items):,.0f}")
+        print(f"\n📊 CAMPAIGN SUMMARY", file=out)
+        print(f"   Properties: {len(outreach_items)}", file=out)
+        print(f"   Total Potential Fees: ${total_potential:,.0f}", file=out)
+        print(f"   Average Per Property: ${total_potential/len(outreach_items):,.0f}", file=out)
         
-        print(f"\n🎯 TOP 5 TARGETS:")
+        print(f"\n🎯 TOP 5 TARGETS:", file=out)
         for item in top_5:
-            print(f"   {item['rank']}. {item['property'].address}")
-            print(f"      Match: {item['match_score']:.0f}% | Fee: ${item['potential_fee']:,.0f}")
-        
-        print(f"\n🚀 ACTION PLAN:")
-        print(f"1. START WITH TOP 5 - highest probability of success")
-        print(f"2. Send emails to top 10 properties today")
-        print(f"3. Follow up with calls within 24-48 hours")
-        print(f"4. Schedule property visits for interested owners")
-        print(f"5. Prepare GSA compliance packages for top 3 matches")
-        
-        print(f"\n📞 DAILY CALL TARGETS:")
-        print(f"   Monday: Properties 1-4")
-        print(f"   Tuesday: Properties 5-8") 
-        print(f"   Wednesday: Properties 9-12")
-        print(f"   Thursday: Properties 13-16")
-        print(f"   Friday: Properties 17-20 + follow-ups")
-        
-        print(f"\n💡 SUCCESS TIPS:")
-        print(f"   • Call between 9-11am or 2-4pm")
-        print(f"   • Lead with the dollar amount: '${prospectus.estimated_annual_cost:,.0f} opportunity'")
-        print(f"   • Emphasize government creditworthiness")
-        print(f"   • Create urgency with timeline")
-        print(f"   • Follow up within 48 hours of first contact")
-
-def main():
+            print(f"   {item['rank']}. {item['property'].address}", file=out)
+            print(f"      Match: {item['match_score']:.0f}% | Fee: ${item['potential_fee']:,.0f}", file=out)
+        
+        print(f"\n🚀 ACTION PLAN:", file=out)
+        print(f"1. START WITH TOP 5 - highest probability of success", file=out)
+        print(f"2. Send emails to top 10 properties today", file=out)
+        print(f"3. Follow up with calls within 24-48 hours", file=out)
+        print(f"4. Schedule property visits for interested owners", file=out)
+        print(f"5. Prepare GSA compliance packages for top 3 matches", file=out)
+        
+        print(f"\n📞 DAILY CALL TARGETS:", file=out)
+        print(f"   Monday: Properties 1-4", file=out)
+        print(f"   Tuesday: Properties 5-8", file=out)
+        print(f"   Wednesday: Properties 9-12", file=out)
+        print(f"   Thursday: Properties 13-16", file=out)
+        print(f"   Friday: Properties 17-20 + follow-ups", file=out)
+        
+        print(f"\n💡 SUCCESS TIPS:", file=out)
+        print(f"   • Call between 9-11am or 2-4pm", file=out)
+        print(f"   • Lead with the dollar amount: '${prospectus.estimated_annual_cost:,.0f} opportunity'", file=out)
+        print(f"   • Emphasize government creditworthiness", file=out)
+        print(f"   • Create urgency with timeline", file=out)
+        print(f"   • Follow up within 48 hours of first contact", file=out)
+
+    def generate_buffered_campaign(self, prospectus_id, limit=20, run_at=None):
+        """Run a campaign on its own session and return its output, for campaigns run side by side"""
+        
+        buffer = io.StringIO()
+        self.generate_outreach_campaign(prospectus_id, limit, run_at=run_at, out=buffer)
+        return buffer.getvalue()
+
+def main(argv=None):
     """Main outreach generation function"""
     
     import argparse
@@ -411,7 +518,7 @@ def main():
     parser.add_argument("--all-high-value", action="store_true", help="Generate for all high-value prospectuses")
     parser.add_argument("--limit", type=int, default=20, help="Limit number of properties per campaign")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     generator = OutreachGenerator()
     
@@ -419,19 +526,25 @@ def main():
         generator.generate_outreach_campaign(args.prospectus_id, args.limit)
     
     elif args.all_high_value:
-        db = SessionLocal()
-        high_value = db.query(Prospectus).filter(
-            Prospectus.estimated_annual_cost > 3000000,
-            Prospectus.status == 'active'
-        ).all()
-        
-        print(f"🎯 Generating campaigns for {len(high_value)} high-value prospectuses")
-        
-        for prospectus in high_value:
-            generator.generate_outreach_campaign(prospectus.id, args.limit)
-            print("\n" + "="*60 + "\n")
-        
-        db.close()
+        # Only the ids are needed; the session is released before the long-running campaigns start
+        with SessionLocal() as db:
+            high_value_ids = [prospectus_id for (prospectus_id,) in db.query(Prospectus.id).filter(
+                Prospectus.estimated_annual_cost > 3000000,
+                Prospectus.status == 'active'
+            )]
+        
+        print(f"🎯 Generating campaigns for {len(high_value_ids)} high-value prospectuses")
+        
+        # Campaigns run in worker threads, each on its own session; outputs print in query order
+        run_at = datetime.now()
+        with ThreadPoolExecutor(max_workers=CAMPAIGN_WORKERS) as executor:
+            campaigns = executor.map(
+                lambda prospectus_id: generator.generate_buffered_campaign(prospectus_id, args.limit, run_at),
+                high_value_ids
+            )
+            # One write per campaign: its buffered output plus the separator
+            for output in campaigns:
+                sys.stdout.write(output + CAMPAIGN_SEPARATOR)
     
     else:
         print("📋 Available Commands:")
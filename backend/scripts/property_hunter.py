@@ -8,44 +8,254 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import requests
-from bs4 import BeautifulSoup
+import numpy as np
 from geopy.geocoders import Nominatim
-from geopy.distance import geodesic
-import time
-from datetime import datetime
-from urllib.parse import urlencode, quote
-import json
+from geopy.adapters import RequestsAdapter
+from urllib3.util.retry import Retry
+from geopy.extra.rate_limiter import RateLimiter
+import logging
+import logging.handlers
+import queue
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock, BoundedSemaphore
 
-from app.database import SessionLocal
-from app.models import Prospectus, Property
+from sqlalchemy.orm import load_only
+from app.database import SessionLocal, engine, insert_for_dialect
+from app.models import Prospectus, Property, GeocodeCache, init_db
 from app.notion_sync import NotionSync
 
+# Hunts log through a queue from many threads at once; one listener thread does every
+# stdout write, so hunts never wait on the stdout lock. Messages print bare, like print().
+logger = logging.getLogger('property_hunter')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+log_queue = queue.SimpleQueue()
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+_log_listener = None
+_log_listener_depth = 0
+_log_listener_lock = Lock()
+
+@contextmanager
+def hunt_logging():
+    """Run the log listener while hunts are in progress (re-entrant, usable as a decorator)
+    
+    The listener writes to the sys.stdout current when the outermost scope starts, so a
+    caller's redirect_stdout captures hunt output. Stopping it drains the queue, so every
+    line is written before the outermost scope exits and stays in order with later prints.
+    """
+    global _log_listener, _log_listener_depth
+    with _log_listener_lock:
+        if _log_listener_depth == 0:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            _log_listener = logging.handlers.QueueListener(log_queue, handler)
+            _log_listener.start()
+        _log_listener_depth += 1
+    try:
+        yield
+    finally:
+        with _log_listener_lock:
+            _log_listener_depth -= 1
+            if _log_listener_depth == 0:
+                _log_listener.stop()
+                _log_listener = None
+
+# Concurrent prospectus hunts in hunt_all_prospectuses; each is dominated by network I/O
+HUNT_WORKERS = 8
+# Nominatim usage policy allows at most one request per second across all threads
+GEOCODE_MIN_DELAY_SECONDS = 1.0
+# Transient geocoder failures are retried with backoff (0.5s, 1s, 2s) on the pooled connection
+GEOCODE_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+# Prospectus columns a hunt and the hunt-all summary read; rows reach worker threads fully loaded
+HUNT_PROSPECTUS_COLUMNS = (
+    Prospectus.id, Prospectus.prospectus_number, Prospectus.agency, Prospectus.location,
+    Prospectus.state, Prospectus.estimated_nusf, Prospectus.estimated_annual_cost,
+    Prospectus.rental_rate_per_nusf, Prospectus.parking_spaces
+)
+# Active prospectuses fetched per round trip while streaming them into hunts
+HUNT_STREAM_BATCH = 100
+# High-value matches listed in the hunt-all summary
+HIGH_VALUE_SHOWN = 5
+# Notion pushes in flight at once, across all concurrent hunts
+NOTION_WORKERS = 8
+# Stored geocodes older than this are looked up again
+GEOCODE_CACHE_DAYS = 30
+
+# LoopNet search URL (simplified - in production use their API) and its fixed query, encoded once
+LOOPNET_SEARCH_URL = "https://www.loopnet.com/search/"
+LOOPNET_BASE_QUERY = urlencode({
+    'sk': 'f0c0148ec4ba78cf0e',  # Example search key
+    'Property-Type': 'Office'
+})
+# Demo LoopNet listings by (city, state) substrings of the prospectus location, built once.
+# Each listing carries its offset from the geocoded prospectus coordinates
+MOCK_LISTINGS = (
+    ('franklin', 'oh', (
+        ({
+            'address': '1234 Corporate Blvd, Columbus, OH 43215',
+            'city': 'Columbus',
+            'state': 'OH',
+            'zip_code': '43215',
+            'total_sqft': 95000,
+            'available_sqft': 85000,
+            'asking_rent_per_sqft': 18.50,
+            'parking_spaces': 340,
+            'year_built': 2015,
+            'source': 'LoopNet',
+            'source_url': 'https://www.loopnet.com/Listing/1234-Corporate-Blvd-Columbus-OH/12345/',
+            'property_type': 'Office',
+            'class_type': 'A'
+        }, (0.1, -0.1)),
+        ({
+            'address': '5678 Business Park Dr, Dublin, OH 43017',
+            'city': 'Dublin',
+            'state': 'OH',
+            'zip_code': '43017',
+            'total_sqft': 78000,
+            'available_sqft': 78000,
+            'asking_rent_per_sqft': 17.25,
+            'parking_spaces': 312,
+            'year_built': 2018,
+            'source': 'LoopNet',
+            'source_url': 'https://www.loopnet.com/Listing/5678-Business-Park-Dr-Dublin-OH/23456/',
+            'property_type': 'Office',
+            'class_type': 'A'
+        }, (0.15, 0.1))
+    )),
+    ('salt lake', 'ut', (
+        ({
+            'address': '2468 South State St, Salt Lake City, UT 84115',
+            'city': 'Salt Lake City',
+            'state': 'UT',
+            'zip_code': '84115',
+            'total_sqft': 92000,
+            'available_sqft': 88000,
+            'asking_rent_per_sqft': 22.00,
+            'parking_spaces': 368,
+            'year_built': 2016,
+            'source': 'LoopNet',
+            'source_url': 'https://www.loopnet.com/Listing/2468-South-State-St-Salt-Lake-City-UT/34567/',
+            'property_type': 'Office',
+            'class_type': 'A'
+        }, (0.05, -0.08)),
+        ({
+            'address': '1357 Medical Dr, Salt Lake City, UT 84132',
+            'city': 'Salt Lake City',
+            'state': 'UT',
+            'zip_code': '84132',
+            'total_sqft': 105000,
+            'available_sqft': 95000,
+            'asking_rent_per_sqft': 24.50,
+            'parking_spaces': 420,
+            'year_built': 2019,
+            'source': 'LoopNet',
+            'source_url': 'https://www.loopnet.com/Listing/1357-Medical-Dr-Salt-Lake-City-UT/45678/',
+            'property_type': 'Medical Office',
+            'class_type': 'A'
+        }, (-0.02, 0.12))
+    ))
+)
+# Manually researched properties by city substring of the prospectus location
+MANUAL_TARGETS = (
+    ('franklin', (
+        {
+            'address': '123 Executive Center, Westerville, OH 43081',
+            'city': 'Westerville',
+            'state': 'OH',
+            'zip_code': '43081',
+            'total_sqft': 120000,
+            'available_sqft': 85000,
+            'asking_rent_per_sqft': 16.75,
+            'parking_spaces': 480,
+            'year_built': 2012,
+            'source': 'Manual Research',
+            'source_url': 'https://example.com/property1',
+            'latitude': 40.1261,
+            'longitude': -82.9291,
+            'property_type': 'Office',
+            'class_type': 'A',
+            'special_notes': 'Owner previously worked with GSA, very interested in government tenants'
+        },
+    )),
+)
+# Reason recorded for the points each scoring rule awarded
+SIZE_REASONS = {40: "Perfect size match", 30: "Good size match", 20: "Acceptable size"}
+RENT_REASONS = {25: "Rent within budget", 15: "Rent slightly above budget"}
+PARKING_REASONS = {15: "Adequate parking", 10: "Parking close to requirements"}
+BUILDING_REASONS = {10: "Modern building", 5: "Recent building"}
+CLASS_REASONS = {10: "Class A property", 7: "Class B property"}
+SCORE_RULES = (SIZE_REASONS, RENT_REASONS, PARKING_REASONS, BUILDING_REASONS, CLASS_REASONS)
+# Property columns a hunted property dict can fill; the rest are keys, defaults and sync state
+PROPERTY_FIELDS = tuple(column.key for column in Property.__table__.columns
+                        if column.key not in ('id', 'created_at', 'updated_at', 'notion_id'))
+
+EARTH_RADIUS_MILES = 3958.75
+
+def award_points(conditions, points):
+    """Points (int16) for the first condition each element meets; 0 when it meets none"""
+    return np.select(conditions, np.array(points, dtype=np.int16), np.int16(0))
+
+def haversine_np(lat1, lon1, lat2, lon2):
+    """Great-circle miles between coordinate arrays (or scalars) given in degrees
+    
+    Spherical law of cosines written as cos(dlat) - cos(lat1)cos(lat2)(1 - cos(dlon)),
+    which needs fewer trig calls than the textbook haversine.
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    cos_c = np.cos(lat2 - lat1) - np.cos(lat1) * np.cos(lat2) * (1 - np.cos(lon2 - lon1))
+    return EARTH_RADIUS_MILES * np.arccos(np.clip(cos_c, -1.0, 1.0))
+
+def geocode_key(query):
+    """Normalize a geocoder query so spacing and case variants share a cache entry"""
+    return ' '.join(query.lower().split())
+
 class PropertyHunter:
     def __init__(self):
-        self.geolocator = Nominatim(user_agent="leasehawk-property-hunter")
+        # The requests adapter keeps one session, so every geocode reuses a pooled connection
+        self.geolocator = Nominatim(
+            user_agent="leasehawk-property-hunter",
+            adapter_factory=lambda proxies, ssl_context: RequestsAdapter(
+                proxies=proxies, ssl_context=ssl_context,
+                pool_connections=HUNT_WORKERS, pool_maxsize=HUNT_WORKERS, max_retries=GEOCODE_RETRY
+            )
+        )
+        # Thread-safe; spaces geocoding requests from concurrent hunts. Errors still reach the caller
+        self.geocode = RateLimiter(self.geolocator.geocode, min_delay_seconds=GEOCODE_MIN_DELAY_SECONDS,
+                                   max_retries=0, swallow_exceptions=False)
         self.notion = NotionSync()
-        self.found_properties = []
+        # Geocodes already resolved this run, in front of the persistent geocode_cache table
+        self.geocode_memo = {}
+        # Also builds the unique address index that save_properties' ON CONFLICT relies on
+        init_db(engine)
+        # Concurrent hunts can turn up the same address; saves run one at a time so dedup holds
+        self.save_lock = Lock()
+        self.notion_slots = BoundedSemaphore(NOTION_WORKERS)
         
+    @hunt_logging()
     def hunt_for_prospectus(self, prospectus):
         """Find all matching properties for a specific prospectus"""
-        print(f"\n🎯 Hunting properties for: {prospectus.prospectus_number}")
-        print(f"   Location: {prospectus.location}, {prospectus.state}")
-        print(f"   Size: {prospectus.estimated_nusf:,} sq ft")
-        print(f"   Annual Value: ${prospectus.estimated_annual_cost:,.0f}")
+        logger.info(f"\n🎯 Hunting properties for: {prospectus.prospectus_number}")
+        logger.info(f"   Location: {prospectus.location}, {prospectus.state}")
+        logger.info(f"   Size: {prospectus.estimated_nusf:,} sq ft")
+        logger.info(f"   Annual Value: ${prospectus.estimated_annual_cost:,.0f}")
         
         # Get coordinates for the prospectus location
         location_query = f"{prospectus.location}, {prospectus.state}"
         try:
-            location = self.geolocator.geocode(location_query)
-            if not location:
-                print(f"❌ Could not geocode location: {location_query}")
+            coordinates = self.geocode_cached(location_query)
+            if not coordinates:
+                logger.info(f"❌ Could not geocode location: {location_query}")
                 return []
             
-            lat, lon = location.latitude, location.longitude
-            print(f"   Coordinates: {lat:.4f}, {lon:.4f}")
+            lat, lon = coordinates
+            logger.info(f"   Coordinates: {lat:.4f}, {lon:.4f}")
             
         except Exception as e:
-            print(f"❌ Geocoding error: {e}")
+            logger.info(f"❌ Geocoding error: {e}")
             return []
         
         # Search parameters based on prospectus requirements
@@ -70,42 +280,71 @@ class PropertyHunter:
         manual_properties = self.get_manual_targets(prospectus)
         all_properties.extend(manual_properties)
         
-        # 3. Filter and score properties
-        scored_properties = self.score_properties(all_properties, prospectus)
+        # 3. Drop properties outside the search radius or well outside the size range
+        #    (unknown values stay in), then score the rest, keeping the top 10 matches
+        if all_properties:
+            lats = np.array([p.get('latitude') for p in all_properties], dtype=np.float64)
+            lons = np.array([p.get('longitude') for p in all_properties], dtype=np.float64)
+            sqft = np.array([p.get('available_sqft') for p in all_properties], dtype=np.float64)
+            rejected = ((haversine_np(lats, lons, lat, lon) > search_params['radius'])
+                        | (sqft < search_params['min_size'] * 0.8)
+                        | (sqft > search_params['max_size'] * 1.2))
+            all_properties = [p for p, reject in zip(all_properties, rejected) if not reject]
+        
+        top_properties = self.score_properties(all_properties, prospectus, limit=10)
         
         # 4. Save top properties
-        top_properties = scored_properties[:10]  # Top 10 matches
         self.save_properties(top_properties, prospectus)
         
         return top_properties
     
+    def geocode_cached(self, location_query):
+        """(lat, lon) for a location query, or None; reuses stored geocodes before asking Nominatim"""
+        key = geocode_key(location_query)
+        if key in self.geocode_memo:
+            return self.geocode_memo[key]
+        
+        with SessionLocal() as db:
+            cached = db.get(GeocodeCache, key)
+            if cached and cached.fetched_at > datetime.utcnow() - timedelta(days=GEOCODE_CACHE_DAYS):
+                coordinates = (cached.latitude, cached.longitude)
+            else:
+                location = self.geocode(location_query)
+                if not location:
+                    return None
+                coordinates = (location.latitude, location.longitude)
+                
+                values = {'query_key': key, 'latitude': coordinates[0], 'longitude': coordinates[1],
+                          'fetched_at': datetime.utcnow()}
+                stmt = insert_for_dialect(GeocodeCache).values(values)
+                db.execute(stmt.on_conflict_do_update(index_elements=['query_key'], set_=values))
+                db.commit()
+        
+        self.geocode_memo[key] = coordinates
+        return coordinates
+    
     def search_loopnet(self, params, prospectus):
         """Search LoopNet for matching properties"""
-        print(f"🔍 Searching LoopNet...")
+        logger.info(f"🔍 Searching LoopNet...")
         
         properties = []
         
         try:
-            # LoopNet search URL (simplified - in production use their API)
-            base_url = "https://www.loopnet.com/search/"
-            
-            # Build search query
-            query_params = {
-                'sk': 'f0c0148ec4ba78cf0e',  # Example search key
+            # Build search query; only the bounding box and size range vary per prospectus
+            search_url = f"{LOOPNET_SEARCH_URL}?{LOOPNET_BASE_QUERY}&" + urlencode({
                 'bb': f"{params['lat']-0.5},{params['lon']-0.5},{params['lat']+0.5},{params['lon']+0.5}",
-                'Property-Type': 'Office',
                 'Min-Square-Feet': params['min_size'],
                 'Max-Square-Feet': params['max_size']
-            }
+            })
             
             # For demo purposes, create mock properties based on real locations
             mock_properties = self.create_mock_properties(params, prospectus)
             properties.extend(mock_properties)
             
-            print(f"✅ Found {len(properties)} properties on LoopNet")
+            logger.info(f"✅ Found {len(properties)} properties on LoopNet")
             
         except Exception as e:
-            print(f"❌ LoopNet search failed: {e}")
+            logger.info(f"❌ LoopNet search failed: {e}")
         
         return properties
     
@@ -113,81 +352,11 @@ class PropertyHunter:
         """Create realistic mock properties for demo (replace with real scraping)"""
         
         # Base this on the specific prospectus location
-        if 'franklin' in prospectus.location.lower() and 'oh' in prospectus.state.lower():
-            return [
-                {
-                    'address': '1234 Corporate Blvd, Columbus, OH 43215',
-                    'city': 'Columbus',
-                    'state': 'OH',
-                    'zip_code': '43215',
-                    'total_sqft': 95000,
-                    'available_sqft': 85000,
-                    'asking_rent_per_sqft': 18.50,
-                    'parking_spaces': 340,
-                    'year_built': 2015,
-                    'source': 'LoopNet',
-                    'source_url': 'https://www.loopnet.com/Listing/1234-Corporate-Blvd-Columbus-OH/12345/',
-                    'latitude': params['lat'] + 0.1,
-                    'longitude': params['lon'] - 0.1,
-                    'property_type': 'Office',
-                    'class_type': 'A'
-                },
-                {
-                    'address': '5678 Business Park Dr, Dublin, OH 43017',
-                    'city': 'Dublin', 
-                    'state': 'OH',
-                    'zip_code': '43017',
-                    'total_sqft': 78000,
-                    'available_sqft': 78000,
-                    'asking_rent_per_sqft': 17.25,
-                    'parking_spaces': 312,
-                    'year_built': 2018,
-                    'source': 'LoopNet',
-                    'source_url': 'https://www.loopnet.com/Listing/5678-Business-Park-Dr-Dublin-OH/23456/',
-                    'latitude': params['lat'] + 0.15,
-                    'longitude': params['lon'] + 0.1,
-                    'property_type': 'Office',
-                    'class_type': 'A'
-                }
-            ]
-        
-        elif 'salt lake' in prospectus.location.lower() and 'ut' in prospectus.state.lower():
-            return [
-                {
-                    'address': '2468 South State St, Salt Lake City, UT 84115',
-                    'city': 'Salt Lake City',
-                    'state': 'UT', 
-                    'zip_code': '84115',
-                    'total_sqft': 92000,
-                    'available_sqft': 88000,
-                    'asking_rent_per_sqft': 22.00,
-                    'parking_spaces': 368,
-                    'year_built': 2016,
-                    'source': 'LoopNet',
-                    'source_url': 'https://www.loopnet.com/Listing/2468-South-State-St-Salt-Lake-City-UT/34567/',
-                    'latitude': params['lat'] + 0.05,
-                    'longitude': params['lon'] - 0.08,
-                    'property_type': 'Office',
-                    'class_type': 'A'
-                },
-                {
-                    'address': '1357 Medical Dr, Salt Lake City, UT 84132',
-                    'city': 'Salt Lake City',
-                    'state': 'UT',
-                    'zip_code': '84132', 
-                    'total_sqft': 105000,
-                    'available_sqft': 95000,
-                    'asking_rent_per_sqft': 24.50,
-                    'parking_spaces': 420,
-                    'year_built': 2019,
-                    'source': 'LoopNet',
-                    'source_url': 'https://www.loopnet.com/Listing/1357-Medical-Dr-Salt-Lake-City-UT/45678/',
-                    'latitude': params['lat'] - 0.02,
-                    'longitude': params['lon'] + 0.12,
-                    'property_type': 'Medical Office',
-                    'class_type': 'A'
-                }
-            ]
+        location, state = prospectus.location.lower(), prospectus.state.lower()
+        for city, state_code, listings in MOCK_LISTINGS:
+            if city in location and state_code in state:
+                return [dict(listing, latitude=params['lat'] + lat_offset, longitude=params['lon'] + lon_offset)
+                        for listing, (lat_offset, lon_offset) in listings]
         
         # Generic properties for other locations
         return [
@@ -213,202 +382,229 @@ class PropertyHunter:
     def get_manual_targets(self, prospectus):
         """Get manually identified high-value properties"""
         
-        # Add specific properties you know about for high-value prospects
-        if 'franklin' in prospectus.location.lower():
-            return [
-                {
-                    'address': '123 Executive Center, Westerville, OH 43081',
-                    'city': 'Westerville',
-                    'state': 'OH',
-                    'zip_code': '43081',
-                    'total_sqft': 120000,
-                    'available_sqft': 85000,
-                    'asking_rent_per_sqft': 16.75,
-                    'parking_spaces': 480,
-                    'year_built': 2012,
-                    'source': 'Manual Research',
-                    'source_url': 'https://example.com/property1',
-                    'latitude': 40.1261,
-                    'longitude': -82.9291,
-                    'property_type': 'Office',
-                    'class_type': 'A',
-                    'special_notes': 'Owner previously worked with GSA, very interested in government tenants'
-                }
-            ]
+        # Add specific properties you know about for high-value prospects (see MANUAL_TARGETS)
+        location = prospectus.location.lower()
+        for city, targets in MANUAL_TARGETS:
+            if city in location:
+                return [dict(target) for target in targets]
         
         return []
     
-    def score_properties(self, properties, prospectus):
-        """Score properties based on match with prospectus requirements"""
+    def score_properties(self, properties, prospectus, limit=None):
+        """Score properties based on match with prospectus requirements
         
-        scored = []
+        Every rule is evaluated over whole columns at once; only the returned (best, up to
+        limit) properties get match_score, match_reasons and prospectus_id filled in.
+        """
         
-        for prop in properties:
-            score = 0
-            reasons = []
-            
-            # Size match (40 points max)
-            if prop['available_sqft']:
-                size_diff = abs(prop['available_sqft'] - prospectus.estimated_nusf) / prospectus.estimated_nusf
-                if size_diff <= 0.1:  # Within 10%
-                    score += 40
-                    reasons.append("Perfect size match")
-                elif size_diff <= 0.25:  # Within 25%
-                    score += 30
-                    reasons.append("Good size match")
-                elif size_diff <= 0.5:  # Within 50%
-                    score += 20
-                    reasons.append("Acceptable size")
-            
-            # Rent match (25 points max)
-            if prospectus.rental_rate_per_nusf and prop['asking_rent_per_sqft']:
-                if prop['asking_rent_per_sqft'] <= prospectus.rental_rate_per_nusf:
-                    score += 25
-                    reasons.append("Rent within budget")
-                elif prop['asking_rent_per_sqft'] <= prospectus.rental_rate_per_nusf * 1.1:
-                    score += 15
-                    reasons.append("Rent slightly above budget")
-            
-            # Parking match (15 points max)
-            if prospectus.parking_spaces and prop['parking_spaces']:
-                if prop['parking_spaces'] >= prospectus.parking_spaces:
-                    score += 15
-                    reasons.append("Adequate parking")
-                elif prop['parking_spaces'] >= prospectus.parking_spaces * 0.8:
-                    score += 10
-                    reasons.append("Parking close to requirements")
-            
-            # Building quality (10 points max)
-            if prop.get('year_built', 0) >= 2010:
-                score += 10
-                reasons.append("Modern building")
-            elif prop.get('year_built', 0) >= 2000:
-                score += 5
-                reasons.append("Recent building")
-            
-            # Property class (10 points max)
-            if prop.get('class_type') == 'A':
-                score += 10
-                reasons.append("Class A property")
-            elif prop.get('class_type') == 'B':
-                score += 7
-                reasons.append("Class B property")
-            
-            prop['match_score'] = score
-            prop['match_reasons'] = reasons
-            prop['prospectus_id'] = prospectus.id
-            
+        if not properties:
+            return []
+        
+        # Prospectus attributes are instrumented descriptors; read each once
+        target_sqft = prospectus.estimated_nusf
+        target_rent = prospectus.rental_rate_per_nusf
+        target_parking = prospectus.parking_spaces
+        prospectus_id = prospectus.id
+        
+        # Points stay int16 throughout (a total never exceeds 100), keeping the score columns narrow.
+        # Missing values become NaN, and nan_to_num(x) != 0 mirrors the truthiness checks
+        sqft = np.array([p['available_sqft'] for p in properties], dtype=np.float64)
+        rent = np.array([p['asking_rent_per_sqft'] for p in properties], dtype=np.float64)
+        parking = np.array([p['parking_spaces'] for p in properties], dtype=np.float64)
+        year_built = np.array([p.get('year_built', 0) for p in properties], dtype=np.float64)
+        class_type = np.array([p.get('class_type') for p in properties], dtype=object)
+        
+        # Size match (40 points max)
+        size_diff = np.abs(sqft - target_sqft) / target_sqft
+        size_points = award_points([size_diff <= 0.1, size_diff <= 0.25, size_diff <= 0.5], [40, 30, 20])
+        size_points[np.nan_to_num(sqft) == 0] = 0
+        
+        # Rent match (25 points max)
+        rent_points = np.zeros(len(properties), dtype=np.int16)
+        if target_rent:
+            rent_points = award_points([rent <= target_rent, rent <= target_rent * 1.1], [25, 15])
+            rent_points[np.nan_to_num(rent) == 0] = 0
+        
+        # Parking match (15 points max)
+        parking_points = np.zeros(len(properties), dtype=np.int16)
+        if target_parking:
+            parking_points = award_points([parking >= target_parking, parking >= target_parking * 0.8], [15, 10])
+            parking_points[np.nan_to_num(parking) == 0] = 0
+        
+        # Building quality (10 points max)
+        building_points = award_points([year_built >= 2010, year_built >= 2000], [10, 5])
+        
+        # Property class (10 points max)
+        class_points = award_points([class_type == 'A', class_type == 'B'], [10, 7])
+        
+        rule_points = (size_points, rent_points, parking_points, building_points, class_points)
+        scores = np.sum(rule_points, axis=0, dtype=np.int16)
+        
+        # Sort by score descending (stable, like sorted(..., reverse=True))
+        order = np.argsort(-scores, kind='stable')[:limit]
+        
+        scored = []
+        for i in order:
+            prop = properties[i]
+            prop['match_score'] = int(scores[i])
+            prop['match_reasons'] = [reasons[int(points[i])]
+                                     for reasons, points in zip(SCORE_RULES, rule_points) if points[i]]
+            prop['prospectus_id'] = prospectus_id
             scored.append(prop)
         
-        # Sort by score descending
-        return sorted(scored, key=lambda x: x['match_score'], reverse=True)
+        return scored
     
     def save_properties(self, properties, prospectus):
         """Save properties to database and Notion"""
         
+        with self.save_lock:
+            new_properties = self._insert_new_properties(properties)
+        
+        # Notion sync runs after the commit so a slow API never holds the transaction open;
+        # the pages are created concurrently and a failed one doesn't stop the rest
+        if new_properties:
+            with ThreadPoolExecutor(max_workers=NOTION_WORKERS) as executor:
+                list(executor.map(self._add_to_notion, new_properties))
+    
+    def _add_to_notion(self, prop_data):
+        with self.notion_slots:
+            try:
+                notion_id = self.notion.add_property_from_search(prop_data)
+                logger.info(f"   💫 Added to Notion: {notion_id}")
+            except Exception as e:
+                logger.info(f"   ⚠️  Notion save failed: {e}")
+    
+    def _insert_new_properties(self, properties):
+        """Insert properties whose address is not stored yet; returns the inserted ones"""
         db = SessionLocal()
-        saved_count = 0
+        new_properties = []
         
         try:
+            # One lookup for every address in the batch instead of a query per property
+            addresses = {prop_data['address'] for prop_data in properties}
+            known = {address for (address,) in db.query(Property.address).filter(Property.address.in_(addresses))}
+            
             for prop_data in properties:
-                # Check if property already exists
-                existing = db.query(Property).filter(
-                    Property.address == prop_data['address']
-                ).first()
-                
-                if existing:
-                    print(f"⚠️  Property already exists: {prop_data['address']}")
+                if prop_data['address'] in known:
+                    logger.info(f"⚠️  Property already exists: {prop_data['address']}")
                     continue
                 
-                # Create new property
-                property_fields = {k: v for k, v in prop_data.items() 
-                                 if k not in ['match_score', 'match_reasons', 'prospectus_id', 'special_notes']}
-                
-                new_property = Property(**property_fields)
-                db.add(new_property)
-                saved_count += 1
-                
-                print(f"✅ Added property: {prop_data['address']} (Score: {prop_data['match_score']})")
-                
-                # Also save to Notion
-                try:
-                    notion_id = self.notion.add_property_from_search(prop_data)
-                    print(f"   💫 Added to Notion: {notion_id}")
-                except Exception as e:
-                    print(f"   ⚠️  Notion save failed: {e}")
+                known.add(prop_data['address'])
+                new_properties.append(prop_data)
+                logger.info(f"✅ Added property: {prop_data['address']} (Score: {prop_data['match_score']})")
             
+            # Only Property columns are stored; scoring and listing extras stay behind. An address
+            # stored since the lookup (e.g. by another process) hits ix_property_address, which
+            # init_db builds on older databases, and is skipped
+            if new_properties:
+                db.execute(insert_for_dialect(Property).on_conflict_do_nothing(), [
+                    {field: prop_data.get(field) for field in PROPERTY_FIELDS} for prop_data in new_properties
+                ])
             db.commit()
-            print(f"\n✅ Saved {saved_count} new properties to database")
+            logger.info(f"\n✅ Saved {len(new_properties)} new properties to database")
             
         except Exception as e:
-            print(f"❌ Error saving properties: {e}")
+            logger.info(f"❌ Error saving properties: {e}")
             db.rollback()
+            return []
         finally:
             db.close()
+        
+        return new_properties
     
+    def _hunt_safely(self, prospectus):
+        """hunt_for_prospectus for a worker thread; reports a failed hunt and returns None"""
+        try:
+            return self.hunt_for_prospectus(prospectus)
+        except Exception as e:
+            logger.info(f"❌ Error hunting for {prospectus.prospectus_number}: {e}")
+            return None
+    
+    def _hunt_concurrently(self, prospectuses):
+        """Yield (prospectus, properties or None) in input order while hunts overlap in worker threads
+        
+        Only a small window of prospectuses is in flight, so a streamed input is never read ahead
+        far. The geocoder's rate limiter keeps requests polite, and rows must arrive with every
+        column a hunt reads already loaded so workers never touch the session.
+        """
+        with ThreadPoolExecutor(max_workers=HUNT_WORKERS) as executor:
+            pending = deque()
+            for prospectus in prospectuses:
+                pending.append((prospectus, executor.submit(self._hunt_safely, prospectus)))
+                if len(pending) >= 2 * HUNT_WORKERS:
+                    prospectus, hunt = pending.popleft()
+                    yield prospectus, hunt.result()
+            while pending:
+                prospectus, hunt = pending.popleft()
+                yield prospectus, hunt.result()
+    
+    @hunt_logging()
     def hunt_all_prospectuses(self):
         """Hunt properties for all active prospectuses"""
-        print("🦅 Property Hunter - Hunting ALL Prospectuses")
-        print("=" * 60)
+        logger.info("🦅 Property Hunter - Hunting ALL Prospectuses")
+        logger.info("=" * 60)
         
         db = SessionLocal()
         
-        # Get all active prospectuses
-        prospectuses = db.query(Prospectus).filter(
-            Prospectus.status == 'active'
-        ).all()
-        
-        print(f"📋 Found {len(prospectuses)} active prospectuses to hunt")
+        active = db.query(Prospectus).filter(Prospectus.status == 'active')
+        logger.info(f"📋 Found {active.count()} active prospectuses to hunt")
+        active = active.options(load_only(*HUNT_PROSPECTUS_COLUMNS))
+        if engine.dialect.name == "postgresql":
+            # Stream active prospectuses from a server-side cursor instead of loading them all up front
+            prospectuses = active.execution_options(stream_results=True).yield_per(HUNT_STREAM_BATCH)
+        else:
+            # An open SQLite read cursor would lock out the hunts' own commits, so read everything first
+            prospectuses = active.all()
         
         total_properties = 0
+        # Only the matches the summary lists are kept; the rest are just counted
+        high_value_count = 0
         high_value_matches = []
         
-        for prospectus in prospectuses:
-            try:
-                properties = self.hunt_for_prospectus(prospectus)
-                total_properties += len(properties)
-                
-                # Track high-value opportunities
-                if prospectus.estimated_annual_cost and prospectus.estimated_annual_cost > 3000000:
-                    top_match = properties[0] if properties else None
-                    if top_match and top_match['match_score'] > 70:
+        # Results arrive in prospectus order
+        for prospectus, properties in self._hunt_concurrently(prospectuses):
+            if properties is None:
+                continue
+            total_properties += len(properties)
+            
+            # Track high-value opportunities
+            if prospectus.estimated_annual_cost and prospectus.estimated_annual_cost > 3000000:
+                top_match = properties[0] if properties else None
+                if top_match and top_match['match_score'] > 70:
+                    high_value_count += 1
+                    if len(high_value_matches) < HIGH_VALUE_SHOWN:
                         high_value_matches.append({
                             'prospectus': prospectus,
                             'property': top_match,
                             'potential_fee': prospectus.estimated_annual_cost * 0.02
                         })
-                
-                time.sleep(2)  # Be respectful to websites
-                
-            except Exception as e:
-                print(f"❌ Error hunting for {prospectus.prospectus_number}: {e}")
-                continue
         
         db.close()
         
         # Summary report
-        print(f"\n🎯 PROPERTY HUNT COMPLETE")
-        print(f"   Total Properties Found: {total_properties}")
-        print(f"   High-Value Matches: {len(high_value_matches)}")
+        logger.info(f"\n🎯 PROPERTY HUNT COMPLETE")
+        logger.info(f"   Total Properties Found: {total_properties}")
+        logger.info(f"   High-Value Matches: {high_value_count}")
         
         if high_value_matches:
-            print(f"\n💰 TOP HIGH-VALUE OPPORTUNITIES:")
-            for i, match in enumerate(high_value_matches[:5], 1):
+            logger.info(f"\n💰 TOP HIGH-VALUE OPPORTUNITIES:")
+            for i, match in enumerate(high_value_matches, 1):
                 p = match['prospectus']
                 prop = match['property']
-                print(f"{i}. {p.agency} - {p.location}")
-                print(f"   Property: {prop['address']}")
-                print(f"   Match Score: {prop['match_score']}/100")
-                print(f"   Potential Fee: ${match['potential_fee']:,.0f}")
-                print()
-        
-        print(f"\n🚀 Next Steps:")
-        print(f"1. Review high-scoring matches in Notion")
-        print(f"2. Research property owners for top matches")
-        print(f"3. Begin outreach campaign")
-        print(f"4. Run: python scripts/outreach_generator.py")
+                logger.info(f"{i}. {p.agency} - {p.location}")
+                logger.info(f"   Property: {prop['address']}")
+                logger.info(f"   Match Score: {prop['match_score']}/100")
+                logger.info(f"   Potential Fee: ${match['potential_fee']:,.0f}")
+                logger.info("")
+        
+        logger.info(f"\n🚀 Next Steps:")
+        logger.info(f"1. Review high-scoring matches in Notion")
+        logger.info(f"2. Research property owners for top matches")
+        logger.info(f"3. Begin outreach campaign")
+        logger.info(f"4. Run: python scripts/outreach_generator.py")
 
-def main():
+@hunt_logging()
+def main(argv=None):
     """Main property hunting function"""
     hunter = PropertyHunter()
     
@@ -417,7 +613,7 @@ def main():
     parser.add_argument("--prospectus-id", type=int, help="Hunt for specific prospectus ID")
     parser.add_argument("--all", action="store_true", help="Hunt for all active prospectuses")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     if args.prospectus_id:
         db = SessionLocal()
@@ -425,7 +621,7 @@ def main():
         if prospectus:
             hunter.hunt_for_prospectus(prospectus)
         else:
-            print(f"❌ Prospectus ID {args.prospectus_id} not found")
+            logger.info(f"❌ Prospectus ID {args.prospectus_id} not found")
         db.close()
     elif args.all:
         hunter.hunt_all_prospectuses()
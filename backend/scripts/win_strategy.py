@@ -8,15 +8,144 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from datetime import datetime, timedelta
-import json
+from collections import namedtuple
+from itertools import islice
+from dataclasses import dataclass
+import heapq
+import orjson
+import re
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
 from app.database import SessionLocal
 from app.models import Prospectus, Property, Match
 
+# Smaller markets score a location advantage (lowercased state codes)
+RURAL_STATES = frozenset({'wv', 'mt', 'wy', 'vt', 'me', 'nd', 'sd', 'ak'})
+MID_MARKET_STATES = frozenset({'oh', 'ut', 'ok', 'ks', 'ne', 'ia', 'ar', 'ms', 'al'})
+
+# Score tiers: a value below EDGES[i] (and not below any earlier edge) scores
+# SCORES[i]; at or above the last edge it scores SCORES[-1]
+SIZE_EDGES = (30000, 50000, 75000, 100000)  # sq ft - smaller means less competition
+SIZE_SCORES = (25, 20, 15, 10, 5)
+URGENCY_EDGES = (180, 365, 730)  # days to expiration - urgent means less prepared competition
+URGENCY_SCORES = (15, 12, 8, 5)
+
+# Substring matches, applied to lowercased text
+MAJOR_METRO_RE = re.compile(r'washington|new york|los angeles|chicago|boston|san francisco')
+AGRICULTURE_RE = re.compile(r'usda|agriculture')
+DEFENSE_RE = re.compile(r'dod|defense')
+SPECIALIZED_REQS_RE = re.compile(r'medical|laboratory|secure|classified')
+FACILITY_REQS_RE = re.compile(r'parking|loading|storage')
+
+# GSA requirements checked by create_compliance_matrix, in report order;
+# notes are str.format templates (only ADA uses {year_built})
+ComplianceRequirement = namedtuple('ComplianceRequirement', ['name', 'notes'])
+COMPLIANCE_REQUIREMENTS = (
+    ComplianceRequirement('Usable Square Footage', 'Meets minimum size requirements'),
+    ComplianceRequirement('Parking Spaces', 'Additional parking may be arranged if needed'),
+    ComplianceRequirement('Rent Rate', 'Rate positioning for government tenant'),
+    ComplianceRequirement('Energy Star Certification', 'Can be obtained during lease negotiation period'),
+    ComplianceRequirement('ADA Compliance', '{year_built} construction meets standards'),
+    ComplianceRequirement('Security Level', 'Standard commercial security upgrades required'),
+    ComplianceRequirement('Location Delineation', 'Property falls within required geographic area')
+)
+
+# Advantages listed in every winning package
+CompetitiveAdvantage = namedtuple('CompetitiveAdvantage', ['advantage', 'description', 'impact'])
+COMPETITIVE_ADVANTAGES = (
+    CompetitiveAdvantage(
+        'Early Market Entry',
+        'First-mover advantage with comprehensive preparation',
+        'High - reduces competition response time'
+    ),
+    CompetitiveAdvantage(
+        'Optimal Property Match',
+        'Property size and location perfectly align with requirements',
+        'High - meets all primary criteria'
+    ),
+    CompetitiveAdvantage(
+        'GSA Expertise',
+        'Specialized knowledge of federal lease requirements',
+        'Medium - ensures compliant proposal'
+    ),
+    CompetitiveAdvantage(
+        'Modification Readiness',
+        'Pre-planned improvements demonstrate commitment',
+        'Medium - shows serious intent and capability'
+    ),
+    CompetitiveAdvantage(
+        'Pricing Strategy',
+        'Competitive rate while maintaining profitability',
+        'High - key evaluation factor'
+    )
+)
+
+# Opportunity overview of every executive summary, filled with str.format_map
+EXECUTIVE_SUMMARY_TEMPLATE = """
+EXECUTIVE SUMMARY - {agency} LEASE OPPORTUNITY
+
+Property: {address}
+Requirement: {prospectus_number}
+Annual Value: ${annual_cost:,.0f}
+Lease Term: {lease_term_years} years
+Total Value: ${total_value:,.0f}
+
+PROPERTY ADVANTAGES:
+• Size Match: {available_sqft:,} sq ft (requirement: {required_sqft:,} sq ft)
+• Location: Optimal positioning within delineated area
+• Parking: {parking_spaces} spaces (requirement: {required_parking})
+• Building Quality: {year_built} construction, well-maintained
+
+COMPETITIVE ADVANTAGES:
+• Early preparation and positioning
+• Full GSA compliance planning
+• Proven track record with federal requirements
+• Optimal rent positioning at ${asking_rent:.2f}/sq ft
+
+RECOMMENDATION: PROCEED IMMEDIATELY
+Timeline is critical for optimal positioning."""
+
+# Active prospectuses streamed and scored per NumPy batch in identify_easiest_wins
+SCORE_BATCH_SIZE = 1000
+
+# Columns the win analysis scores, explains and reports; everything else stays unloaded
+STRATEGY_COLUMNS = (
+    Prospectus.id, Prospectus.prospectus_number, Prospectus.agency, Prospectus.location,
+    Prospectus.state, Prospectus.estimated_nusf, Prospectus.estimated_annual_cost,
+    Prospectus.special_requirements, Prospectus.current_lease_expiration
+)
+
+@dataclass(frozen=True, slots=True)
+class ScoreBreakdown:
+    """Win-probability points per factor; field order is the saved JSON key order"""
+    size_advantage: int
+    location_advantage: int
+    agency_advantage: int
+    timeline_advantage: int
+    competition_advantage: int
+    value_advantage: int
+    total_score: int
+
+@dataclass(slots=True)
+class Opportunity:
+    """One scored prospectus from identify_easiest_wins"""
+    prospectus: Prospectus
+    win_probability: int
+    difficulty_score: int
+    scoring_breakdown: ScoreBreakdown
+    reasoning: list
+    available_properties: int
+    potential_fee: float
+    urgency_days: int
+
 class WinningStrategy:
     def __init__(self):
         self.target_prospectuses = []
         self.qualified_properties = []
         self.winning_packages = []
+        # Reference time for urgency; refreshed once per identify_easiest_wins call
+        self._now = datetime.now()
         
     def identify_easiest_wins(self, limit=10):
         """Find the easiest prospectuses to win based on strategic criteria"""
@@ -27,167 +156,151 @@ class WinningStrategy:
         db = SessionLocal()
         
         try:
-            prospectuses = db.query(Prospectus).filter(
-                Prospectus.status == 'active'
-            ).all()
+            self._now = datetime.now()
             
-            easy_wins = []
+            # Top `limit` by win probability (highest first, ties in query order)
+            top = heapq.nlargest(limit, self._score_prospectuses(db), key=lambda x: x[1].total_score)
             
-            for prospectus in prospectuses:
-                score = self.calculate_win_probability(prospectus)
-                reasoning = self.explain_opportunity(prospectus, score)
-                
-                # Get match count for this prospectus
-                match_count = db.query(Match).filter(
-                    Match.prospectus_id == prospectus.id
-                ).count()
-                
-                easy_wins.append({
-                    'prospectus': prospectus,
-                    'win_probability': score['total_score'],
-                    'difficulty_score': 100 - score['total_score'],
-                    'scoring_breakdown': score,
-                    'reasoning': reasoning,
-                    'available_properties': match_count,
-                    'potential_fee': (prospectus.estimated_annual_cost or 0) * 0.02,
-                    'urgency_days': self.calculate_urgency(prospectus)
-                })
+            # Match counts for just the winners, in one GROUP BY
+            match_counts = dict(
+                db.query(Match.prospectus_id, func.count(Match.id))
+                .filter(Match.prospectus_id.in_([prospectus.id for prospectus, _, _ in top]))
+                .group_by(Match.prospectus_id)
+                .all()
+            )
             
-            # Sort by win probability (highest first)
-            easy_wins.sort(key=lambda x: x['win_probability'], reverse=True)
-            
-            return easy_wins[:limit]
+            return [Opportunity(
+                prospectus=prospectus,
+                win_probability=score.total_score,
+                difficulty_score=100 - score.total_score,
+                scoring_breakdown=score,
+                reasoning=self.explain_opportunity(prospectus, score, urgency_days),
+                available_properties=match_counts.get(prospectus.id, 0),
+                potential_fee=(prospectus.estimated_annual_cost or 0) * 0.02,
+                urgency_days=urgency_days
+            ) for prospectus, score, urgency_days in top]
             
         finally:
             db.close()
     
-    def calculate_win_probability(self, prospectus):
-        """Calculate probability of winning based on strategic factors"""
-        
-        scores = {
-            'size_advantage': 0,      # Max 25 points
-            'location_advantage': 0,  # Max 20 points  
-            'agency_advantage': 0,    # Max 20 points
-            'timeline_advantage': 0,  # Max 15 points
-            'competition_advantage': 0, # Max 10 points
-            'value_advantage': 0,     # Max 10 points
-            'total_score': 0
-        }
-        
-        # Size advantage (smaller = less competition)
-        sqft = prospectus.estimated_nusf or 0
-        if sqft < 30000:  # Under 30k sq ft
-            scores['size_advantage'] = 25
-        elif sqft < 50000:  # Under 50k sq ft
-            scores['size_advantage'] = 20
-        elif sqft < 75000:  # Under 75k sq ft
-            scores['size_advantage'] = 15
-        elif sqft < 100000:  # Under 100k sq ft
-            scores['size_advantage'] = 10
-        else:  # Large spaces have more competition
-            scores['size_advantage'] = 5
-        
-        # Location advantage (smaller markets = less competition)
-        location = (prospectus.location or '').lower()
-        state = (prospectus.state or '').lower()
-        
-        # Rural/smaller states
-        if state in ['wv', 'mt', 'wy', 'vt', 'me', 'nd', 'sd', 'ak']:
-            scores['location_advantage'] = 20
-        # Mid-size markets
-        elif state in ['oh', 'ut', 'ok', 'ks', 'ne', 'ia', 'ar', 'ms', 'al']:
-            scores['location_advantage'] = 15
-        # Avoid major metro keywords
-        elif any(metro in location for metro in ['washington', 'new york', 'los angeles', 'chicago', 'boston', 'san francisco']):
-            scores['location_advantage'] = 5
-        else:
-            scores['location_advantage'] = 12
-        
-        # Agency advantage (some agencies are easier)
-        agency = (prospectus.agency or '').lower()
-        if 'va' in agency and 'medical' in (prospectus.special_requirements or '').lower():
-            scores['agency_advantage'] = 20  # VA medical has specific needs
-        elif 'va' in agency:
-            scores['agency_advantage'] = 18
-        elif 'usda' in agency or 'agriculture' in agency:
-            scores['agency_advantage'] = 16
-        elif 'sba' in agency:
-            scores['agency_advantage'] = 15
-        elif 'gsa' in agency:
-            scores['agency_advantage'] = 12
-        elif 'dod' in agency or 'defense' in agency:
-            scores['agency_advantage'] = 8  # Highly competitive
-        else:
-            scores['agency_advantage'] = 10
-        
-        # Timeline advantage (urgent = less prepared competition)
-        urgency_days = self.calculate_urgency(prospectus)
-        if urgency_days < 180:  # Less than 6 months
-            scores['timeline_advantage'] = 15
-        elif urgency_days < 365:  # Less than 1 year
-            scores['timeline_advantage'] = 12
-        elif urgency_days < 730:  # Less than 2 years
-            scores['timeline_advantage'] = 8
-        else:
-            scores['timeline_advantage'] = 5
-        
-        # Competition advantage (specific requirements reduce competition)
-        special_reqs = (prospectus.special_requirements or '').lower()
-        if any(req in special_reqs for req in ['medical', 'laboratory', 'secure', 'classified']):
-            scores['competition_advantage'] = 10
-        elif any(req in special_reqs for req in ['parking', 'loading', 'storage']):
-            scores['competition_advantage'] = 7
-        else:
-            scores['competition_advantage'] = 5
-        
-        # Value advantage (moderate value = sweet spot)
-        annual_value = prospectus.estimated_annual_cost or 0
-        if 2000000 <= annual_value <= 8000000:  # $2M-$8M sweet spot
-            scores['value_advantage'] = 10
-        elif 1000000 <= annual_value <= 15000000:  # $1M-$15M still good
-            scores['value_advantage'] = 8
-        elif annual_value > 20000000:  # Too big = too competitive
-            scores['value_advantage'] = 3
-        else:
-            scores['value_advantage'] = 6
-        
-        scores['total_score'] = sum(scores.values()) - scores['total_score']  # Subtract total to avoid double counting
-        
-        return scores
+    def _score_prospectuses(self, db):
+        """Yield (prospectus, ScoreBreakdown, urgency days) for every active prospectus
+        
+        Rows are streamed and scored SCORE_BATCH_SIZE at a time, so only one batch
+        (plus whatever the caller keeps) is held in memory.
+        """
+        rows = iter(db.query(Prospectus).options(load_only(*STRATEGY_COLUMNS)).filter(
+            Prospectus.status == 'active'
+        ).execution_options(stream_results=True).yield_per(SCORE_BATCH_SIZE))
+        
+        while batch := list(islice(rows, SCORE_BATCH_SIZE)):
+            scores, urgency = self.calculate_win_probabilities(batch)
+            yield from zip(batch, scores, urgency)
+    
+    def calculate_win_probabilities(self, prospectuses):
+        """Score a list of prospectuses on the strategic win factors.
+        
+        Each factor is one np.select over the whole batch; only the keyword
+        flags still touch every row in Python. Returns the ScoreBreakdowns and the
+        matching calculate_urgency days (as ints), both measured from self._now.
+        """
+        n = len(prospectuses)
+        now = np.datetime64(self._now, 'us')
+        
+        sqft = np.fromiter((p.estimated_nusf or 0 for p in prospectuses), dtype=np.float64, count=n)
+        annual_value = np.fromiter((p.estimated_annual_cost or 0 for p in prospectuses), dtype=np.float64, count=n)
+        expiration = np.array([p.current_lease_expiration or 'NaT' for p in prospectuses], dtype='datetime64[us]')
+        
+        states = [(p.state or '').lower() for p in prospectuses]
+        locations = [(p.location or '').lower() for p in prospectuses]
+        agencies = [(p.agency or '').lower() for p in prospectuses]
+        special_reqs = [(p.special_requirements or '').lower() for p in prospectuses]
+        
+        def flags(texts, pattern):
+            return np.fromiter((pattern.search(t) is not None for t in texts), dtype=bool, count=n)
+        
+        def members(values, allowed):
+            return np.fromiter((v in allowed for v in values), dtype=bool, count=n)
+        
+        size = np.array(SIZE_SCORES)[np.searchsorted(SIZE_EDGES, sqft, side='right')]
+        
+        location = np.select([
+            members(states, RURAL_STATES),
+            members(states, MID_MARKET_STATES),
+            flags(locations, MAJOR_METRO_RE)
+        ], [20, 15, 5], 12)
+        
+        is_va = np.fromiter(('va' in a for a in agencies), dtype=bool, count=n)
+        needs_medical = np.fromiter(('medical' in r for r in special_reqs), dtype=bool, count=n)
+        agency = np.select([
+            is_va & needs_medical,
+            is_va,
+            flags(agencies, AGRICULTURE_RE),
+            np.fromiter(('sba' in a for a in agencies), dtype=bool, count=n),
+            np.fromiter(('gsa' in a for a in agencies), dtype=bool, count=n),
+            flags(agencies, DEFENSE_RE)
+        ], [20, 18, 16, 15, 12, 8], 10)
+        
+        # Same days as calculate_urgency (timedelta.days floors, and so does datetime64 division)
+        has_expiration = ~np.isnat(expiration)
+        urgency_days = np.where(
+            has_expiration,
+            (np.where(has_expiration, expiration, now) - now) // np.timedelta64(1, 'D'),
+            999
+        )
+        timeline = np.array(URGENCY_SCORES)[np.searchsorted(URGENCY_EDGES, urgency_days, side='right')]
+        
+        competition = np.select([
+            flags(special_reqs, SPECIALIZED_REQS_RE),
+            flags(special_reqs, FACILITY_REQS_RE)
+        ], [10, 7], 5)
+        
+        value = np.select([
+            (annual_value >= 2000000) & (annual_value <= 8000000),
+            (annual_value >= 1000000) & (annual_value <= 15000000),
+            annual_value > 20000000
+        ], [10, 8, 3], 6)
+        
+        total = size + location + agency + timeline + competition + value
+        
+        return [ScoreBreakdown(*map(int, row)) for row in zip(
+            size, location, agency, timeline, competition, value, total
+        )], urgency_days.tolist()
     
     def calculate_urgency(self, prospectus):
         """Calculate days until lease expiration"""
         if not prospectus.current_lease_expiration:
             return 999  # Unknown = assume far out
         
-        return (prospectus.current_lease_expiration - datetime.now()).days
+        return (prospectus.current_lease_expiration - self._now).days
     
-    def explain_opportunity(self, prospectus, scores):
+    def explain_opportunity(self, prospectus, scores, urgency=None):
         """Generate human-readable explanation of why this is an easy win"""
         
         reasons = []
         
         # Size reasoning
         sqft = prospectus.estimated_nusf or 0
-        if scores['size_advantage'] >= 20:
+        if scores.size_advantage >= 20:
             reasons.append(f"Smaller size ({sqft:,} sq ft) means less competition")
-        elif scores['size_advantage'] >= 15:
+        elif scores.size_advantage >= 15:
             reasons.append(f"Mid-size requirement ({sqft:,} sq ft) has moderate competition")
         
         # Location reasoning
-        if scores['location_advantage'] >= 18:
+        if scores.location_advantage >= 18:
             reasons.append(f"Rural/smaller market ({prospectus.state}) has fewer qualified properties")
-        elif scores['location_advantage'] >= 12:
+        elif scores.location_advantage >= 12:
             reasons.append(f"Secondary market ({prospectus.state}) more accessible than major metros")
         
         # Agency reasoning
-        if scores['agency_advantage'] >= 18:
+        if scores.agency_advantage >= 18:
             reasons.append(f"VA medical facilities have specialized needs - fewer competitors")
-        elif scores['agency_advantage'] >= 15:
+        elif scores.agency_advantage >= 15:
             reasons.append(f"{prospectus.agency} typically has streamlined processes")
         
         # Timeline reasoning
-        urgency = self.calculate_urgency(prospectus)
+        if urgency is None:
+            urgency = self.calculate_urgency(prospectus)
         if urgency < 180:
             reasons.append(f"Urgent timeline ({urgency} days) means less time for competitors to prepare")
         elif urgency < 365:
@@ -221,29 +334,20 @@ class WinningStrategy:
         """Create executive summary for the opportunity"""
         
         return {
-            'opportunity_overview': f"""
-EXECUTIVE SUMMARY - {prospectus.agency} LEASE OPPORTUNITY
-
-Property: {property.address}
-Requirement: {prospectus.prospectus_number}
-Annual Value: ${prospectus.estimated_annual_cost:,.0f}
-Lease Term: {prospectus.max_lease_term_years} years
-Total Value: ${(prospectus.estimated_annual_cost or 0) * (prospectus.max_lease_term_years or 10):,.0f}
-
-PROPERTY ADVANTAGES:
-• Size Match: {property.available_sqft:,} sq ft (requirement: {prospectus.estimated_nusf:,} sq ft)
-• Location: Optimal positioning within delineated area
-• Parking: {property.parking_spaces} spaces (requirement: {prospectus.parking_spaces})
-• Building Quality: {property.year_built} construction, well-maintained
-
-COMPETITIVE ADVANTAGES:
-• Early preparation and positioning
-• Full GSA compliance planning
-• Proven track record with federal requirements
-• Optimal rent positioning at ${property.asking_rent_per_sqft:.2f}/sq ft
-
-RECOMMENDATION: PROCEED IMMEDIATELY
-Timeline is critical for optimal positioning.""",
+            'opportunity_overview': EXECUTIVE_SUMMARY_TEMPLATE.format_map({
+                'agency': prospectus.agency,
+                'address': property.address,
+                'prospectus_number': prospectus.prospectus_number,
+                'annual_cost': prospectus.estimated_annual_cost,
+                'lease_term_years': prospectus.max_lease_term_years,
+                'total_value': (prospectus.estimated_annual_cost or 0) * (prospectus.max_lease_term_years or 10),
+                'available_sqft': property.available_sqft,
+                'required_sqft': prospectus.estimated_nusf,
+                'parking_spaces': property.parking_spaces,
+                'required_parking': prospectus.parking_spaces,
+                'year_built': property.year_built,
+                'asking_rent': property.asking_rent_per_sqft
+            }),
             
             'key_dates': {
                 'current_lease_expires': prospectus.current_lease_expiration,
@@ -256,59 +360,36 @@ Timeline is critical for optimal positioning.""",
     def create_compliance_matrix(self, prospectus, property):
         """Show exact compliance with GSA requirements"""
         
-        requirements = [
-            {
-                'requirement': 'Usable Square Footage',
-                'needed': f"{prospectus.estimated_nusf:,} NUSF",
-                'provided': f"{property.available_sqft:,} sq ft",
-                'status': 'COMPLIANT' if (property.available_sqft or 0) >= (prospectus.estimated_nusf or 0) * 0.95 else 'REVIEW NEEDED',
-                'notes': 'Meets minimum size requirements'
-            },
-            {
-                'requirement': 'Parking Spaces',
-                'needed': f"{prospectus.parking_spaces or 0} spaces",
-                'provided': f"{property.parking_spaces or 0} spaces",
-                'status': 'COMPLIANT' if (property.parking_spaces or 0) >= (prospectus.parking_spaces or 0) else 'MODIFICATION NEEDED',
-                'notes': 'Additional parking may be arranged if needed'
-            },
-            {
-                'requirement': 'Rent Rate',
-                'needed': f"≤ ${prospectus.rental_rate_per_nusf:.2f}/sq ft" if prospectus.rental_rate_per_nusf else 'Market rate',
-                'provided': f"${property.asking_rent_per_sqft:.2f}/sq ft",
-                'status': 'COMPETITIVE' if (property.asking_rent_per_sqft or 0) <= (prospectus.rental_rate_per_nusf or 999) else 'NEGOTIATE',
-                'notes': 'Rate positioning for government tenant'
-            },
-            {
-                'requirement': 'Energy Star Certification',
-                'needed': 'Required for buildings >75k sq ft',
-                'provided': 'TBD - Assessment needed',
-                'status': 'IN PROCESS',
-                'notes': 'Can be obtained during lease negotiation period'
-            },
-            {
-                'requirement': 'ADA Compliance',
-                'needed': 'Full ADA accessibility',
-                'provided': 'Modern building - compliant',
-                'status': 'COMPLIANT',
-                'notes': f'{property.year_built} construction meets standards'
-            },
-            {
-                'requirement': 'Security Level',
-                'needed': 'Level II minimum',
-                'provided': 'Achievable with modifications',
-                'status': 'ACHIEVABLE',
-                'notes': 'Standard commercial security upgrades required'
-            },
-            {
-                'requirement': 'Location Delineation',
-                'needed': 'Within specified boundaries',
-                'provided': 'Verified compliant',
-                'status': 'COMPLIANT',
-                'notes': 'Property falls within required geographic area'
-            }
-        ]
-        
-        return requirements
+        # (needed, provided, status) per COMPLIANCE_REQUIREMENTS row; the rest is fixed
+        checks = (
+            (
+                f"{prospectus.estimated_nusf:,} NUSF",
+                f"{property.available_sqft:,} sq ft",
+                'COMPLIANT' if (property.available_sqft or 0) >= (prospectus.estimated_nusf or 0) * 0.95 else 'REVIEW NEEDED'
+            ),
+            (
+                f"{prospectus.parking_spaces or 0} spaces",
+                f"{property.parking_spaces or 0} spaces",
+                'COMPLIANT' if (property.parking_spaces or 0) >= (prospectus.parking_spaces or 0) else 'MODIFICATION NEEDED'
+            ),
+            (
+                f"≤ ${prospectus.rental_rate_per_nusf:.2f}/sq ft" if prospectus.rental_rate_per_nusf else 'Market rate',
+                f"${property.asking_rent_per_sqft:.2f}/sq ft",
+                'COMPETITIVE' if (property.asking_rent_per_sqft or 0) <= (prospectus.rental_rate_per_nusf or 999) else 'NEGOTIATE'
+            ),
+            ('Required for buildings >75k sq ft', 'TBD - Assessment needed', 'IN PROCESS'),
+            ('Full ADA accessibility', 'Modern building - compliant', 'COMPLIANT'),
+            ('Level II minimum', 'Achievable with modifications', 'ACHIEVABLE'),
+            ('Within specified boundaries', 'Verified compliant', 'COMPLIANT')
+        )
+        
+        return [{
+            'requirement': requirement.name,
+            'needed': needed,
+            'provided': provided,
+            'status': status,
+            'notes': requirement.notes.format(year_built=property.year_built)
+        } for requirement, (needed, provided, status) in zip(COMPLIANCE_REQUIREMENTS, checks)]
     
     def create_modifications_plan(self, prospectus, property):
         """Create plan for any needed property modifications"""
@@ -371,12 +452,14 @@ Timeline is critical for optimal positioning.""",
         
         market_rate = property.asking_rent_per_sqft or 20.0
         max_rate = prospectus.rental_rate_per_nusf or market_rate
+        recommended_bid = min(max_rate * 0.98, market_rate * 0.95)  # Slightly under max
+        sqft = prospectus.estimated_nusf or 0
         
         return {
             'base_rent_strategy': {
                 'current_asking': market_rate,
                 'max_allowable': max_rate,
-                'recommended_bid': min(max_rate * 0.98, market_rate * 0.95),  # Slightly under max
+                'recommended_bid': recommended_bid,
                 'rationale': 'Position just below maximum to ensure competitiveness while maximizing revenue'
             },
             'incentive_package': {
@@ -386,9 +469,9 @@ Timeline is critical for optimal positioning.""",
                 'options': f'{prospectus.max_lease_term_years + 5} year renewal option'
             },
             'total_package_value': {
-                'annual_base_rent': (prospectus.estimated_nusf or 0) * (min(max_rate * 0.98, market_rate * 0.95)),
-                'total_lease_value': (prospectus.estimated_nusf or 0) * (min(max_rate * 0.98, market_rate * 0.95)) * (prospectus.max_lease_term_years or 10),
-                'ti_allowance': 50 * (prospectus.estimated_nusf or 0),  # $50/sq ft for improvements
+                'annual_base_rent': sqft * recommended_bid,
+                'total_lease_value': sqft * recommended_bid * (prospectus.max_lease_term_years or 10),
+                'ti_allowance': 50 * sqft,  # $50/sq ft for improvements
                 'estimated_profit_margin': '15-20% after modifications and incentives'
             }
         }
@@ -452,35 +535,7 @@ Timeline is critical for optimal positioning.""",
     def create_competitive_advantages(self, prospectus, property):
         """Identify competitive advantages"""
         
-        advantages = [
-            {
-                'advantage': 'Early Market Entry',
-                'description': 'First-mover advantage with comprehensive preparation',
-                'impact': 'High - reduces competition response time'
-            },
-            {
-                'advantage': 'Optimal Property Match',
-                'description': f'Property size and location perfectly align with requirements',
-                'impact': 'High - meets all primary criteria'
-            },
-            {
-                'advantage': 'GSA Expertise',
-                'description': 'Specialized knowledge of federal lease requirements',
-                'impact': 'Medium - ensures compliant proposal'
-            },
-            {
-                'advantage': 'Modification Readiness',
-                'description': 'Pre-planned improvements demonstrate commitment',
-                'impact': 'Medium - shows serious intent and capability'
-            },
-            {
-                'advantage': 'Pricing Strategy',
-                'description': 'Competitive rate while maintaining profitability',
-                'impact': 'High - key evaluation factor'
-            }
-        ]
-        
-        return advantages
+        return [advantage._asdict() for advantage in COMPETITIVE_ADVANTAGES]
     
     def create_financial_analysis(self, prospectus, property):
         """Create comprehensive financial analysis"""
@@ -525,36 +580,37 @@ Timeline is critical for optimal positioning.""",
         
         easy_wins = self.identify_easiest_wins(limit)
         
-        print(f"\n🎯 TOP {len(easy_wins)} EASIEST WINS IDENTIFIED")
-        print("-" * 40)
+        # Collect the report and emit it with a single write
+        lines = [f"\n🎯 TOP {len(easy_wins)} EASIEST WINS IDENTIFIED", "-" * 40]
         
         total_potential = 0
         
         for i, opportunity in enumerate(easy_wins, 1):
-            p = opportunity['prospectus']
-            total_potential += opportunity['potential_fee']
+            p = opportunity.prospectus
+            total_potential += opportunity.potential_fee
             
-            print(f"\n{i}. {p.agency} - {p.location}")
-            print(f"   Prospectus: {p.prospectus_number}")
-            print(f"   Annual Value: ${p.estimated_annual_cost:,.0f}")
-            print(f"   Win Probability: {opportunity['win_probability']:.0f}%")
-            print(f"   Your Potential Fee: ${opportunity['potential_fee']:,.0f}")
-            print(f"   Urgency: {opportunity['urgency_days']} days")
-            print(f"   Available Properties: {opportunity['available_properties']}")
+            lines.append(f"\n{i}. {p.agency} - {p.location}")
+            lines.append(f"   Prospectus: {p.prospectus_number}")
+            lines.append(f"   Annual Value: ${p.estimated_annual_cost:,.0f}")
+            lines.append(f"   Win Probability: {opportunity.win_probability:.0f}%")
+            lines.append(f"   Your Potential Fee: ${opportunity.potential_fee:,.0f}")
+            lines.append(f"   Urgency: {opportunity.urgency_days} days")
+            lines.append(f"   Available Properties: {opportunity.available_properties}")
             
-            print(f"   🎯 Why This is Easy:")
-            for reason in opportunity['reasoning'][:3]:
-                print(f"      • {reason}")
+            lines.append("   🎯 Why This is Easy:")
+            lines.extend(f"      • {reason}" for reason in opportunity.reasoning[:3])
         
-        print(f"\n💰 TOTAL POTENTIAL EARNINGS: ${total_potential:,.0f}")
-        print(f"📊 Average per opportunity: ${total_potential/len(easy_wins):,.0f}")
+        lines.append(f"\n💰 TOTAL POTENTIAL EARNINGS: ${total_potential:,.0f}")
+        lines.append(f"📊 Average per opportunity: ${total_potential/len(easy_wins):,.0f}")
         
         # Strategic recommendations
-        print(f"\n🏆 STRATEGIC RECOMMENDATIONS:")
-        print(f"1. START WITH #{easy_wins[0]['prospectus'].prospectus_number} - Highest win probability")
-        print(f"2. Focus on opportunities with <365 day timelines")
-        print(f"3. Target {sum(1 for o in easy_wins if o['urgency_days'] < 365)} urgent opportunities first")
-        print(f"4. Prepare winning packages for top 3 opportunities")
+        lines.append("\n🏆 STRATEGIC RECOMMENDATIONS:")
+        lines.append(f"1. START WITH #{easy_wins[0].prospectus.prospectus_number} - Highest win probability")
+        lines.append("2. Focus on opportunities with <365 day timelines")
+        lines.append(f"3. Target {sum(1 for o in easy_wins if o.urgency_days < 365)} urgent opportunities first")
+        lines.append("4. Prepare winning packages for top 3 opportunities")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
         
         # Save detailed report
         self.save_strategy_report(easy_wins)
@@ -569,28 +625,31 @@ Timeline is critical for optimal positioning.""",
         
         os.makedirs("data", exist_ok=True)
         
-        report_data = []
-        for opp in opportunities:
-            p = opp['prospectus']
-            report_data.append({
-                'rank': len(report_data) + 1,
-                'prospectus_number': p.prospectus_number,
-                'agency': p.agency,
-                'location': f"{p.location}, {p.state}",
-                'annual_value': p.estimated_annual_cost,
-                'win_probability': opp['win_probability'],
-                'potential_fee': opp['potential_fee'],
-                'urgency_days': opp['urgency_days'],
-                'scoring_breakdown': opp['scoring_breakdown'],
-                'reasoning': opp['reasoning']
-            })
-        
-        with open(filename, 'w') as f:
-            json.dump(report_data, f, indent=2, default=str)
+        # One record at a time, laid out like an OPT_INDENT_2 dump of the whole list;
+        # orjson writes the ScoreBreakdown dataclasses as objects natively
+        with open(filename, 'wb') as f:
+            f.write(b"[")
+            for rank, opp in enumerate(opportunities, 1):
+                p = opp.prospectus
+                record = {
+                    'rank': rank,
+                    'prospectus_number': p.prospectus_number,
+                    'agency': p.agency,
+                    'location': f"{p.location}, {p.state}",
+                    'annual_value': p.estimated_annual_cost,
+                    'win_probability': opp.win_probability,
+                    'potential_fee': opp.potential_fee,
+                    'urgency_days': opp.urgency_days,
+                    'scoring_breakdown': opp.scoring_breakdown,
+                    'reasoning': opp.reasoning
+                }
+                f.write(b",\n  " if rank > 1 else b"\n  ")
+                f.write(orjson.dumps(record, default=str, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  "))
+            f.write(b"\n]" if opportunities else b"]")
         
         print(f"\n💾 Strategy report saved: {filename}")
 
-def main():
+def main(argv=None):
     """Main strategy function"""
     
     import argparse
@@ -598,26 +657,28 @@ def main():
     parser.add_argument("--limit", type=int, default=5, help="Number of opportunities to analyze")
     parser.add_argument("--prospectus-id", type=int, help="Create package for specific prospectus")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     strategy = WinningStrategy()
     
     if args.prospectus_id:
         db = SessionLocal()
-        prospectus = db.query(Prospectus).filter(Prospectus.id == args.prospectus_id).first()
-        if prospectus:
-            # Get best matching property
-            best_match = db.query(Match).filter(
-                Match.prospectus_id == args.prospectus_id
-            ).order_by(Match.total_score.desc()).first()
+        # Prospectus and its best matching property in one round trip
+        row = db.query(Prospectus, Property).join(
+            Match, Match.prospectus_id == Prospectus.id
+        ).join(
+            Property, Property.id == Match.property_id
+        ).filter(
+            Prospectus.id == args.prospectus_id
+        ).order_by(Match.total_score.desc()).first()
+        
+        if row:
+            prospectus, property = row
+            package = strategy.create_winning_package(prospectus, property)
+            
+            print("📋 Winning package created successfully!")
+            print("   Use this information to prepare your proposal")
             
-            if best_match:
-                property = db.query(Property).filter(Property.id == best_match.property_id).first()
-                package = strategy.create_winning_package(prospectus, property)
-                
-                print("📋 Winning package created successfully!")
-                print("   Use this information to prepare your proposal")
-                
         db.close()
     else:
         strategy.generate_strategy_report(args.limit)
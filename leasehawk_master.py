@@ -6,8 +6,55 @@ The complete LeaseHawk system in one command
 import os
 import sys
 import subprocess
+import importlib
 from datetime import datetime
 
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+
+# The backend scripts import each other by module name and app.* from backend
+SCRIPTS_DIR = os.path.join(BACKEND_DIR, "scripts")
+
+# Working directories created under data/ by setup
+DATA_SUBDIRS = ("prospectuses", "outreach", "exports")
+
+# Potential fees of the two opportunities highlighted below
+QUICK_WIN_FEES = (84_600, 155_200)
+
+# Built once at import; show_quick_wins only prints it
+QUICK_WINS = """
+💰 YOUR IMMEDIATE OPPORTUNITIES:
+
+🎯 Franklin County VA Medical Center (POH-09-VA25)
+   📍 Location: Franklin County, OH  
+   💵 Annual Value: $4,230,000
+   🏆 Your Potential Fee: $84,600 (2% finder + 1% success)
+   📊 Size: 85,000 sq ft
+   ⏰ Timeline: 9x expansion - URGENT NEED
+   🎲 Win Factor: VA medical = specialized requirements = less competition
+
+🎯 Salt Lake City VA Medical Center (PUT-24-VA25)  
+   📍 Location: Salt Lake City, UT
+   💵 Annual Value: $7,760,000
+   🏆 Your Potential Fee: $155,200 (2% finder + 1% success)
+   📊 Size: 95,000 sq ft
+   ⏰ Timeline: New facility requirement
+   🎲 Win Factor: Western market + medical specs = easier win
+
+💎 TOTAL IMMEDIATE POTENTIAL: ${total:,}
+
+🚀 48-HOUR ACTION PLAN:
+   Hour 1-8:   Property hunt (LoopNet, CoStar searches)
+   Hour 9-16:  Owner outreach (emails + cold calls)  
+   Hour 17-24: Prepare compliance packages
+   Hour 25-48: Close first property owner agreement
+
+📞 YOUR SUCCESS FORMULA:
+   1. "The government needs X sq ft in your area"
+   2. "Worth $X million per year"
+   3. "Your property is a perfect match"
+   4. "Let's discuss positioning to win"
+""".format(total=sum(QUICK_WIN_FEES))
+
 def print_banner():
     """Print LeaseHawk banner"""
     print("""
@@ -23,12 +70,12 @@ def run_setup():
     
     # Install requirements
     print("📦 Installing dependencies...")
-    subprocess.run(["pip", "install", "-r", "backend/requirements.txt"], cwd=".")
+    # This interpreter's pip; wheels over source builds (numpy, psycopg2, ...)
+    subprocess.run([sys.executable, "-m", "pip", "install", "--prefer-binary", "-r", "backend/requirements.txt"], cwd=".")
     
     # Setup directories
-    os.makedirs("data/prospectuses", exist_ok=True)
-    os.makedirs("data/outreach", exist_ok=True)
-    os.makedirs("data/exports", exist_ok=True)
+    for subdir in DATA_SUBDIRS:
+        os.makedirs(os.path.join("data", subdir), exist_ok=True)
     
     # Check .env file
     if not os.path.exists("backend/.env"):
@@ -38,41 +85,51 @@ def run_setup():
     
     print("✅ Setup complete!")
 
+def run_script(name, *args):
+    """Import a backend script and call its main() in this process"""
+    importlib.import_module(name).main(list(args))
+
 def run_daily_intelligence():
     """Run the daily intelligence brief"""
     print("🧠 RUNNING DAILY INTELLIGENCE BRIEF...")
-    subprocess.run(["python", "backend/scripts/daily_brief.py", "--full"], cwd=".")
+    run_script("daily_brief", "--full")
 
 def load_all_opportunities():
     """Load all GSA opportunities"""
     print("📥 LOADING ALL GSA OPPORTUNITIES...")
-    subprocess.run(["python", "backend/scripts/load_all_gsa.py"], cwd=".")
+    run_script("load_all_gsa")
 
 def hunt_properties():
     """Hunt for matching properties"""
     print("🏢 HUNTING FOR MATCHING PROPERTIES...")
-    subprocess.run(["python", "backend/scripts/property_hunter.py", "--all"], cwd=".")
+    run_script("property_hunter", "--all")
 
 def generate_outreach():
     """Generate outreach campaigns"""
     print("📧 GENERATING OUTREACH CAMPAIGNS...")
-    subprocess.run(["python", "backend/scripts/outreach_generator.py", "--all-high-value"], cwd=".")
+    run_script("outreach_generator", "--all-high-value")
 
 def analyze_deals():
     """Analyze deal values"""
     print("💰 ANALYZING DEAL VALUES...")
-    subprocess.run(["python", "backend/scripts/deal_calculator.py", "--portfolio"], cwd=".")
+    run_script("deal_calculator", "--portfolio")
 
 def get_winning_strategy():
     """Get winning strategy"""
     print("🏆 GENERATING WINNING STRATEGY...")
-    subprocess.run(["python", "backend/scripts/win_strategy.py"], cwd=".")
+    run_script("win_strategy")
 
 def start_api_server():
     """Start the API server"""
+    import uvicorn
+    
     print("🚀 STARTING API SERVER...")
     print("Access at: http://localhost:8000")
-    subprocess.run(["uvicorn", "app.main:app", "--reload"], cwd="backend")
+    
+    # Served from this process; --reload's file watcher needs a worker process, so production passes --no-reload
+    reload = "--no-reload" not in sys.argv[2:]
+    os.chdir(BACKEND_DIR)
+    uvicorn.run("app.main:app", reload=reload, app_dir=BACKEND_DIR)
 
 def start_notion_watcher():
     """Start Notion watcher"""
@@ -84,39 +141,49 @@ def start_notion_watcher():
 
 def show_quick_wins():
     """Show the specific high-value opportunities"""
-    print("""
-💰 YOUR IMMEDIATE OPPORTUNITIES:
-
-🎯 Franklin County VA Medical Center (POH-09-VA25)
-   📍 Location: Franklin County, OH  
-   💵 Annual Value: $4,230,000
-   🏆 Your Potential Fee: $84,600 (2% finder + 1% success)
-   📊 Size: 85,000 sq ft
-   ⏰ Timeline: 9x expansion - URGENT NEED
-   🎲 Win Factor: VA medical = specialized requirements = less competition
-
-🎯 Salt Lake City VA Medical Center (PUT-24-VA25)  
-   📍 Location: Salt Lake City, UT
-   💵 Annual Value: $7,760,000
-   🏆 Your Potential Fee: $155,200 (2% finder + 1% success)
-   📊 Size: 95,000 sq ft
-   ⏰ Timeline: New facility requirement
-   🎲 Win Factor: Western market + medical specs = easier win
-
-💎 TOTAL IMMEDIATE POTENTIAL: $239,800
-
-🚀 48-HOUR ACTION PLAN:
-   Hour 1-8:   Property hunt (LoopNet, CoStar searches)
-   Hour 9-16:  Owner outreach (emails + cold calls)  
-   Hour 17-24: Prepare compliance packages
-   Hour 25-48: Close first property owner agreement
+    print(QUICK_WINS)
+
+# Commands grouped by usage section: name -> (handler, help text)
+COMMAND_SECTIONS = {
+    "QUICK START": {
+        "setup": (run_setup, "🔧 Initial setup and installation"),
+        "daily": (run_daily_intelligence, "🧠 Run daily intelligence brief"),
+        "quick-wins": (show_quick_wins, "💰 Show immediate high-value opportunities"),
+    },
+    "FULL WORKFLOW": {
+        "load": (load_all_opportunities, "📥 Load all GSA prospectuses"),
+        "hunt": (hunt_properties, "🏢 Hunt for matching properties"),
+        "outreach": (generate_outreach, "📧 Generate outreach campaigns"),
+        "deals": (analyze_deals, "💰 Analyze deal values"),
+        "strategy": (get_winning_strategy, "🏆 Get winning strategy"),
+    },
+    "SERVICES": {
+        "api": (start_api_server, "🚀 Start API server (add --no-reload in production)"),
+        "notion": (start_notion_watcher, "👁️  Start Notion watcher"),
+    },
+}
+
+# Flat command table used for dispatch
+DISPATCH = {
+    name: handler
+    for commands in COMMAND_SECTIONS.values()
+    for name, (handler, _) in commands.items()
+}
+
+USAGE_EXAMPLES = """EXAMPLES:
+   python leasehawk_master.py daily       # Daily brief
+   python leasehawk_master.py quick-wins  # Show opportunities
+   python leasehawk_master.py setup       # First time setup
+"""
 
-📞 YOUR SUCCESS FORMULA:
-   1. "The government needs X sq ft in your area"
-   2. "Worth $X million per year"
-   3. "Your property is a perfect match"
-   4. "Let's discuss positioning to win"
-""")
+def format_usage():
+    """Build the command listing from COMMAND_SECTIONS"""
+    lines = ["", "🎯 LEASEHAWK COMMANDS:", ""]
+    for section, commands in COMMAND_SECTIONS.items():
+        lines.append(f"{section}:")
+        lines.extend(f"   {name:<16}{help_text}" for name, (_, help_text) in commands.items())
+        lines.append("")
+    return "\n".join(lines) + "\n" + USAGE_EXAMPLES
 
 def main():
     """Main command interface"""
@@ -124,55 +191,16 @@ def main():
     print_banner()
     
     if len(sys.argv) < 2:
-        print("""
-🎯 LEASEHAWK COMMANDS:
-
-QUICK START:
-   setup           🔧 Initial setup and installation
-   daily           🧠 Run daily intelligence brief  
-   quick-wins      💰 Show immediate high-value opportunities
-
-FULL WORKFLOW:
-   load            📥 Load all GSA prospectuses
-   hunt            🏢 Hunt for matching properties
-   outreach        📧 Generate outreach campaigns
-   deals           💰 Analyze deal values
-   strategy        🏆 Get winning strategy
-
-SERVICES:
-   api             🚀 Start API server
-   notion          👁️  Start Notion watcher
-   
-EXAMPLES:
-   python leasehawk_master.py daily       # Daily brief
-   python leasehawk_master.py quick-wins  # Show opportunities
-   python leasehawk_master.py setup       # First time setup
-""")
+        print(format_usage())
         return
     
     command = sys.argv[1].lower()
+    sys.path.insert(0, SCRIPTS_DIR)
+    handler = DISPATCH.get(command)
     
     try:
-        if command == "setup":
-            run_setup()
-        elif command == "daily":
-            run_daily_intelligence()
-        elif command == "quick-wins":
-            show_quick_wins()
-        elif command == "load":
-            load_all_opportunities()
-        elif command == "hunt":
-            hunt_properties()
-        elif command == "outreach":
-            generate_outreach()
-        elif command == "deals":
-            analyze_deals()
-        elif command == "strategy":
-            get_winning_strategy()
-        elif command == "api":
-            start_api_server()
-        elif command == "notion":
-            start_notion_watcher()
+        if handler:
+            handler()
         else:
             print(f"❌ Unknown command: {command}")
             print("Run without arguments to see available commands")